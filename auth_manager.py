@@ -12,12 +12,17 @@ from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 
 
+# PBKDF2 rounds for new password hashes; accounts record the count they were hashed with
+PBKDF2_ITERATIONS = 100000
+
+
 class AuthenticationManager:
     """Manages user authentication and credentials"""
     
     def __init__(self, accounts_file: str = "accounts.json", 
                  enable_accounts: bool = False,
-                 require_authentication: bool = False):
+                 require_authentication: bool = False,
+                 kdf_iterations: int = PBKDF2_ITERATIONS):
         """
         Initialize authentication manager
         
@@ -25,8 +30,10 @@ class AuthenticationManager:
             accounts_file: Path to persistent accounts storage
             enable_accounts: Enable persistent user accounts
             require_authentication: Require authentication for all users
+            kdf_iterations: PBKDF2 rounds for newly set passwords
         """
         self.accounts_file = accounts_file
+        self.kdf_iterations = kdf_iterations
         self.enable_accounts = enable_accounts
         self.require_authentication = require_authentication
         self.accounts: Dict[str, Dict[str, Any]] = {}
@@ -36,13 +43,15 @@ class AuthenticationManager:
         if self.enable_accounts:
             self.load_accounts()
     
-    def hash_password(self, password: str, salt: Optional[bytes] = None) -> tuple:
+    def hash_password(self, password: str, salt: Optional[bytes] = None,
+                      iterations: Optional[int] = None) -> tuple:
         """
         Hash password using PBKDF2-HMAC-SHA256
         
         Args:
             password: Plain text password
             salt: Optional salt (generated if not provided)
+            iterations: PBKDF2 rounds (defaults to kdf_iterations)
             
         Returns:
             (hashed_password, salt) tuple
@@ -50,12 +59,11 @@ class AuthenticationManager:
         if salt is None:
             salt = secrets.token_bytes(32)
         
-        # Use PBKDF2 with 100,000 iterations
         hashed = hashlib.pbkdf2_hmac(
             'sha256',
             password.encode('utf-8'),
             salt,
-            100000
+            iterations or self.kdf_iterations
         )
         
         return (hashed, salt)
@@ -77,8 +85,10 @@ class AuthenticationManager:
         account = self.accounts[username]
         stored_hash = bytes.fromhex(account['password_hash'])
         salt = bytes.fromhex(account['salt'])
+        # Accounts saved before the count was recorded used the default
+        iterations = account.get('kdf_iterations', PBKDF2_ITERATIONS)
         
-        hashed, _ = self.hash_password(password, salt)
+        hashed, _ = self.hash_password(password, salt, iterations)
         
         return hmac.compare_digest(hashed, stored_hash)
     
@@ -104,6 +114,7 @@ class AuthenticationManager:
             'username': username,
             'password_hash': hashed.hex(),
             'salt': salt.hex(),
+            'kdf_iterations': self.kdf_iterations,
             'email': email,
             'created_at': datetime.utcnow().isoformat(),
             'last_login': None,
@@ -237,6 +248,7 @@ class AuthenticationManager:
         
         self.accounts[username]['password_hash'] = hashed.hex()
         self.accounts[username]['salt'] = salt.hex()
+        self.accounts[username]['kdf_iterations'] = self.kdf_iterations
         
         if self.enable_accounts:
             self.save_accounts()
@@ -314,5 +326,6 @@ class AuthenticationManager:
         # Don't expose password hash and salt
         account.pop('password_hash', None)
         account.pop('salt', None)
+        account.pop('kdf_iterations', None)
         
         return account
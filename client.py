@@ -5,16 +5,20 @@ All messages are end-to-end encrypted
 
 import asyncio
 import argparse
+import functools
 import logging
 import json
 import sys
 import os
+import socket
 import base64
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from protocol import Protocol, MessageType
 from crypto_layer import CryptoLayer, ChannelCrypto
 from image_transfer import ImageTransfer
+from rate_limiter import RateLimiter
 
 
 # Try to import colorama for colored output
@@ -30,9 +34,72 @@ except ImportError:
         BRIGHT = DIM = RESET_ALL = ""
 
 
+@functools.lru_cache(maxsize=256)
+def message_prefix(sender: str, private: bool = False, channel: Optional[str] = None) -> str:
+    """Build the coloured prefix for a chat line; senders repeat, so it is cached"""
+    if private:
+        return f"{Fore.MAGENTA}[PM from {sender}]{Style.RESET_ALL}"
+    elif channel:
+        return f"{Fore.YELLOW}[{channel}] {sender}:{Style.RESET_ALL}"
+    else:
+        return f"{Fore.WHITE}{sender}:{Style.RESET_ALL}"
+
+
 logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger('JustIRC-Client')
 
+# Each distinct log message is emitted at most this many times per second,
+# so a decrypt-failure storm (e.g. after a peer rotates keys) cannot flood
+# stderr and stall the event loop.
+LOG_RATE_LIMIT = 5
+
+
+class LogRateLimitFilter(logging.Filter):
+    """Drop repeats of a log message beyond a per-second budget"""
+    
+    def __init__(self, max_per_second: int = LOG_RATE_LIMIT):
+        super().__init__()
+        self.limiter = RateLimiter(max_per_second, 1.0)
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Keyed on the unformatted message so every failure of a kind shares a budget
+        return self.limiter.is_allowed(record.msg)
+
+
+logger.addFilter(LogRateLimitFilter())
+
+# Inbound frames from a single sender are handled on one of a fixed pool of
+# dispatch workers, so a slow handler (decrypting a burst, waiting on an image
+# prompt) only holds up that sender. Each worker queue holds this many frames
+# before the receive loop waits for it to catch up.
+DISPATCH_WORKERS = 4
+DISPATCH_QUEUE_SIZE = 256
+
+# Message types that only concern their sender and may run on the worker pool.
+# Everything else changes shared state (keys, membership) and is applied in
+# order once the workers have drained. A rekey request belongs to the latter:
+# answering it regenerates our own key pair and every peer's shared secret.
+SENDER_MESSAGE_TYPES = frozenset({
+    MessageType.PRIVATE_MESSAGE.value,
+    MessageType.CHANNEL_MESSAGE.value,
+    MessageType.REKEY_RESPONSE.value,
+    MessageType.IMAGE_START.value,
+    MessageType.IMAGE_CHUNK.value,
+    MessageType.IMAGE_END.value,
+})
+
+# Connection tuning: image chunks arrive as large single-line frames, and
+# chat traffic is small writes that should not wait on Nagle's algorithm.
+READ_BUFFER_LIMIT = 1 << 20
+WRITE_BUFFER_HIGH = 256 * 1024
+WRITE_BUFFER_LOW = 64 * 1024
+
+FRAME_DELIMITER = b'\n'
+
+# Payloads at least this long are decrypted on a worker thread so the event
+# loop keeps reading; shorter ones are cheaper to decrypt inline.
+OFFLOAD_DECRYPT_SIZE = 4096
+
 
 class IRCClient:
     """IRC Client with E2E encryption"""
@@ -43,9 +110,14 @@ class IRCClient:
         self.nickname = nickname
         self.user_id: Optional[str] = None
         
+        # Pre-encoded from_id field, rebuilt when user_id changes
+        self._from_id_field = b''
+        self._from_id_source: Optional[str] = None
+        
         # Cryptography
         self.crypto = CryptoLayer()
         self.channel_crypto = ChannelCrypto()
+        self._crypto_executor: Optional[ThreadPoolExecutor] = None
         
         # Image transfers
         self.image_transfer = ImageTransfer(self.crypto)
@@ -56,10 +128,32 @@ class IRCClient:
         
         # State
         self.users = {}  # user_id -> {nickname, public_key}
+        self.user_ids = {}  # nickname -> user_id, kept in step with users
         self.current_channel: Optional[str] = None
         self.joined_channels = set()
         self.pending_images = {}  # image_id -> {sender, metadata, accepted, queued_chunks}
         
+        # Inbound dispatch, keyed by message type value
+        self._message_handlers = {
+            MessageType.ACK.value: self.handle_ack,
+            MessageType.USER_LIST.value: self.handle_user_list,
+            MessageType.PUBLIC_KEY_RESPONSE.value: self.handle_public_key_response,
+            MessageType.REKEY_REQUEST.value: self.handle_rekey_request,
+            MessageType.REKEY_RESPONSE.value: self.handle_rekey_response,
+            MessageType.PRIVATE_MESSAGE.value: self.handle_private_message,
+            MessageType.CHANNEL_MESSAGE.value: self.handle_channel_message,
+            MessageType.JOIN_CHANNEL.value: self.handle_user_joined,
+            MessageType.LEAVE_CHANNEL.value: self.handle_user_left,
+            MessageType.IMAGE_START.value: self.handle_image_start,
+            MessageType.IMAGE_CHUNK.value: self.handle_image_chunk,
+            MessageType.IMAGE_END.value: self.handle_image_end,
+            MessageType.KICK_USER.value: self.handle_kick,
+            MessageType.SET_TOPIC.value: self.handle_topic,
+            MessageType.ERROR.value: self.handle_error,
+        }
+        self._dispatch_queues = []
+        self._dispatch_workers = []
+        
         self.running = False
     
     async def connect(self):
@@ -67,9 +161,12 @@ class IRCClient:
         try:
             # Try to connect with 10 second timeout
             self.reader, self.writer = await asyncio.wait_for(
-                asyncio.open_connection(self.server_host, self.server_port),
+                asyncio.open_connection(
+                    self.server_host, self.server_port, limit=READ_BUFFER_LIMIT
+                ),
                 timeout=10.0
             )
+            self.tune_connection()
             self.running = True
             
             self.print_info(f"Connected to {self.server_host}:{self.server_port}")
@@ -85,6 +182,17 @@ class IRCClient:
             self.print_error(f"Connection failed: {e}")
             return False
     
+    def tune_connection(self):
+        """Set socket options and write buffer limits on the open connection"""
+        sock = self.writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        
+        self.writer.transport.set_write_buffer_limits(
+            high=WRITE_BUFFER_HIGH, low=WRITE_BUFFER_LOW
+        )
+    
     async def register(self):
         """Register with the server"""
         # Send registration with public key
@@ -96,28 +204,50 @@ class IRCClient:
     
     async def send(self, message: str):
         """Send a message to the server"""
-        self.writer.write(message.encode('utf-8') + b'\n')
-        await self.writer.drain()
+        await self.send_bytes(message.encode('utf-8'))
+    
+    async def send_bytes(self, payload: bytes):
+        """Send an already-encoded message to the server"""
+        # Hand both buffers to the transport rather than concatenating
+        self.writer.writelines((payload, FRAME_DELIMITER))
+        
+        # Only yield to the transport once it is holding data back, or to
+        # surface the error if the connection is closing
+        transport = self.writer.transport
+        if transport.get_write_buffer_size() > WRITE_BUFFER_LOW or transport.is_closing():
+            await self.writer.drain()
+    
+    def get_from_id_field(self) -> bytes:
+        """Get the pre-encoded from_id field for outbound messages"""
+        if self._from_id_source != self.user_id:
+            self._from_id_field = Protocol.encode_field('from_id', self.user_id)
+            self._from_id_source = self.user_id
+        return self._from_id_field
     
     async def receive_loop(self):
         """Receive messages from server"""
+        self.start_dispatch_workers()
         try:
             while self.running:
                 data = await self.reader.readline()
                 if not data:
                     break
                 
-                message_str = data.decode('utf-8').strip()
-                if not message_str:
+                # Parse straight from bytes; image chunk frames are large and
+                # decoding then stripping them would copy each one twice
+                if data.isspace():
                     continue
                 
                 try:
-                    message = json.loads(message_str)
-                    await self.handle_message(message)
-                except json.JSONDecodeError:
-                    logger.error(f"Invalid JSON: {message_str}")
-                except Exception as e:
-                    logger.error(f"Error handling message: {e}")
+                    message = json.loads(data)
+                except ValueError:
+                    logger.warning("Invalid JSON: %r", data[:200])
+                    continue
+                
+                await self.queue_message(message)
+            
+            # Deliver whatever was read before the connection closed
+            await self.drain_dispatch_queues()
         
         except asyncio.CancelledError:
             pass
@@ -125,70 +255,89 @@ class IRCClient:
             self.print_error(f"Connection lost: {e}")
         finally:
             self.running = False
+            self.stop_dispatch_workers()
     
-    async def handle_message(self, message: dict):
-        """Handle incoming message"""
-        msg_type = message.get('type')
-        
-        if msg_type == MessageType.ACK.value:
-            await self.handle_ack(message)
-        
-        elif msg_type == MessageType.USER_LIST.value:
-            await self.handle_user_list(message)
-        
-        elif msg_type == MessageType.PUBLIC_KEY_RESPONSE.value:
-            await self.handle_public_key_response(message)
-        
-        elif msg_type == MessageType.REKEY_REQUEST.value:
-            await self.handle_rekey_request(message)
-        
-        elif msg_type == MessageType.REKEY_RESPONSE.value:
-            await self.handle_rekey_response(message)
-        
-        elif msg_type == MessageType.PRIVATE_MESSAGE.value:
-            await self.handle_private_message(message)
-        
-        elif msg_type == MessageType.CHANNEL_MESSAGE.value:
-            await self.handle_channel_message(message)
-        
-        elif msg_type == MessageType.JOIN_CHANNEL.value:
-            await self.handle_user_joined(message)
-        
-        elif msg_type == MessageType.LEAVE_CHANNEL.value:
-            await self.handle_user_left(message)
-        
-        elif msg_type == MessageType.IMAGE_START.value:
-            await self.handle_image_start(message)
-        
-        elif msg_type == MessageType.IMAGE_CHUNK.value:
-            await self.handle_image_chunk(message)
+    def start_dispatch_workers(self):
+        """Start the inbound dispatch worker pool"""
+        self._dispatch_queues = [
+            asyncio.Queue(maxsize=DISPATCH_QUEUE_SIZE) for _ in range(DISPATCH_WORKERS)
+        ]
+        self._dispatch_workers = [
+            asyncio.create_task(self.dispatch_worker(queue)) for queue in self._dispatch_queues
+        ]
+    
+    def stop_dispatch_workers(self):
+        """Cancel the inbound dispatch worker pool"""
+        for worker in self._dispatch_workers:
+            worker.cancel()
+        self._dispatch_workers = []
+        self._dispatch_queues = []
+    
+    async def drain_dispatch_queues(self):
+        """Wait until every queued inbound message has been handled"""
+        for queue in self._dispatch_queues:
+            await queue.join()
+    
+    async def queue_message(self, message: dict):
+        """Queue an inbound message for dispatch"""
+        from_id = message.get('from_id')
         
-        elif msg_type == MessageType.IMAGE_END.value:
-            await self.handle_image_end(message)
+        if from_id and message.get('type') in SENDER_MESSAGE_TYPES:
+            # Only waits when the sender's worker has fallen behind
+            queue = self._dispatch_queues[hash(from_id) % len(self._dispatch_queues)]
+            await queue.put(message)
+            return
         
-        elif msg_type == MessageType.KICK_USER.value:
-            # User was kicked from a channel
-            channel = message.get('channel')
-            kicked_by = message.get('kicked_by')
-            reason = message.get('reason', 'No reason given')
-            
-            if channel in self.joined_channels:
-                self.joined_channels.remove(channel)
-                if channel == self.current_channel:
-                    self.current_channel = None
-                self.print_error(f"You were kicked from {channel} by {kicked_by}: {reason}")
-        
-        elif msg_type == MessageType.SET_TOPIC.value:
-            # Channel topic was changed
-            channel = message.get('channel')
-            topic = message.get('topic', '')
-            set_by = message.get('set_by')
-            
+        # State changes apply only after earlier messages have been handled
+        await self.drain_dispatch_queues()
+        await self.run_handler(message)
+    
+    async def dispatch_worker(self, queue: asyncio.Queue):
+        """Handle queued inbound messages in arrival order"""
+        while True:
+            message = await queue.get()
+            try:
+                await self.run_handler(message)
+            finally:
+                queue.task_done()
+    
+    async def run_handler(self, message: dict):
+        """Handle an inbound message, logging any handler error"""
+        try:
+            await self.handle_message(message)
+        except Exception as e:
+            logger.warning("Error handling message: %s", e)
+    
+    async def handle_message(self, message: dict):
+        """Handle incoming message"""
+        handler = self._message_handlers.get(message.get('type'))
+        if handler:
+            await handler(message)
+    
+    async def handle_kick(self, message: dict):
+        """Handle being kicked from a channel"""
+        channel = message.get('channel')
+        kicked_by = message.get('kicked_by')
+        reason = message.get('reason', 'No reason given')
+        
+        if channel in self.joined_channels:
+            self.joined_channels.remove(channel)
             if channel == self.current_channel:
-                self.print_info(f"[{channel}] Topic set by {set_by}: {topic}")
-        
-        elif msg_type == MessageType.ERROR.value:
-            self.print_error(f"Server error: {message.get('error')}")
+                self.current_channel = None
+            self.print_error(f"You were kicked from {channel} by {kicked_by}: {reason}")
+    
+    async def handle_topic(self, message: dict):
+        """Handle channel topic change"""
+        channel = message.get('channel')
+        topic = message.get('topic', '')
+        set_by = message.get('set_by')
+        
+        if channel == self.current_channel:
+            self.print_info(f"[{channel}] Topic set by {set_by}: {topic}")
+    
+    async def handle_error(self, message: dict):
+        """Handle server error"""
+        self.print_error(f"Server error: {message.get('error')}")
     
     async def handle_ack(self, message: dict):
         """Handle acknowledgment"""
@@ -197,7 +346,8 @@ class IRCClient:
             self.print_success(message.get('message', 'Connected'))
         
         elif 'channel' in message:
-            channel = message['channel']
+            # Interned: the name is compared against every inbound channel message
+            channel = sys.intern(message['channel'])
             self.joined_channels.add(channel)
             self.current_channel = channel
             
@@ -205,10 +355,7 @@ class IRCClient:
             members = message.get('members', [])
             for member in members:
                 if member['user_id'] != self.user_id:
-                    self.users[member['user_id']] = {
-                        'nickname': member['nickname'],
-                        'public_key': member['public_key']
-                    }
+                    self.set_user(member['user_id'], member['nickname'], member['public_key'])
                     self.crypto.load_peer_public_key(
                         member['user_id'],
                         member['public_key']
@@ -220,10 +367,7 @@ class IRCClient:
         """Handle user list update"""
         users = message.get('users', [])
         for user in users:
-            self.users[user['user_id']] = {
-                'nickname': user['nickname'],
-                'public_key': user['public_key']
-            }
+            self.set_user(user['user_id'], user['nickname'], user['public_key'])
             # Preload public key
             self.crypto.load_peer_public_key(user['user_id'], user['public_key'])
         
@@ -236,13 +380,26 @@ class IRCClient:
                 # Initial user list
                 self.print_info(f"{len(users)} users online")
     
+    def set_user(self, user_id: str, nickname: str, public_key: Optional[str]):
+        """Record a known user and keep the nickname index in step"""
+        # Interned so users and the index share one copy of each identifier
+        user_id = sys.intern(user_id)
+        nickname = sys.intern(nickname)
+        
+        previous = self.users.get(user_id)
+        if previous and self.user_ids.get(previous['nickname']) == user_id:
+            del self.user_ids[previous['nickname']]
+        
+        self.users[user_id] = {'nickname': nickname, 'public_key': public_key}
+        self.user_ids[nickname] = user_id
+    
     async def handle_public_key_response(self, message: dict):
         """Handle public key response"""
         user_id = message['user_id']
         nickname = message['nickname']
         public_key = message['public_key']
         
-        self.users[user_id] = {'nickname': nickname, 'public_key': public_key}
+        self.set_user(user_id, nickname, public_key)
         self.crypto.load_peer_public_key(user_id, public_key)
     
     async def handle_rekey_request(self, message: dict):
@@ -289,11 +446,7 @@ class IRCClient:
     async def initiate_key_rotation(self, target_nickname: str):
         """Initiate key rotation with a user"""
         # Find the target user
-        target_id = None
-        for user_id, info in self.users.items():
-            if info['nickname'] == target_nickname:
-                target_id = user_id
-                break
+        target_id = self.user_ids.get(target_nickname)
         
         if not target_id:
             self.print_error(f"User {target_nickname} not found")
@@ -320,13 +473,15 @@ class IRCClient:
         
         try:
             # Decrypt message
-            plaintext = self.crypto.decrypt(from_id, encrypted_data, nonce)
+            plaintext = await self.decrypt_payload(
+                self.crypto.decrypt, from_id, encrypted_data, nonce
+            )
             sender = self.users.get(from_id, {}).get('nickname', from_id)
             
             self.print_message(sender, plaintext, private=True)
         
         except Exception as e:
-            self.print_error(f"Failed to decrypt message from {from_id}: {e}")
+            logger.warning("Failed to decrypt message from %s: %s", from_id, e)
     
     async def handle_channel_message(self, message: dict):
         """Handle encrypted channel message"""
@@ -348,13 +503,28 @@ class IRCClient:
         
         try:
             # Decrypt message
-            plaintext = self.crypto.decrypt(from_id, encrypted_data, nonce)
+            plaintext = await self.decrypt_payload(
+                self.crypto.decrypt, from_id, encrypted_data, nonce
+            )
             sender_nick = self.users.get(from_id, {}).get('nickname', from_id)
             
             self.print_message(sender_nick, plaintext, channel=channel)
         
         except Exception as e:
-            logger.error(f"Failed to decrypt channel message: {e}")
+            logger.warning("Failed to decrypt channel message: %s", e)
+    
+    async def decrypt_payload(self, decrypt, from_id: str, encrypted_data, nonce: str):
+        """Decrypt inline, or on the crypto thread pool for large payloads"""
+        if len(encrypted_data) < OFFLOAD_DECRYPT_SIZE:
+            return decrypt(from_id, encrypted_data, nonce)
+        
+        if self._crypto_executor is None:
+            self._crypto_executor = ThreadPoolExecutor(
+                max_workers=os.cpu_count(), thread_name_prefix='justirc-crypto'
+            )
+        return await asyncio.get_running_loop().run_in_executor(
+            self._crypto_executor, decrypt, from_id, encrypted_data, nonce
+        )
     
     async def handle_user_joined(self, message: dict):
         """Handle user joined notification"""
@@ -364,7 +534,7 @@ class IRCClient:
         public_key = message.get('public_key')
         
         if user_id != self.user_id:
-            self.users[user_id] = {'nickname': nickname, 'public_key': public_key}
+            self.set_user(user_id, nickname, public_key)
             if public_key:
                 self.crypto.load_peer_public_key(user_id, public_key)
             
@@ -438,30 +608,30 @@ class IRCClient:
     
     async def handle_image_chunk(self, message: dict):
         """Handle image chunk - only process if accepted"""
+        # Check if this is a pending transfer before reading the rest
+        pending = self.pending_images.get(message['image_id'])
+        if pending is None:
+            return  # Unknown transfer, ignore
+        
+        # If declined, ignore
+        if pending['accepted'] is False:
+            return
+        
         from_id = message['from_id']
         image_id = message['image_id']
         chunk_number = message['chunk_number']
         encrypted_data = message['encrypted_data']
         nonce = message['nonce']
         
-        # Check if this is a pending transfer
-        if image_id not in self.pending_images:
-            return  # Unknown transfer, ignore
-        
-        pending = self.pending_images[image_id]
-        
         # If user hasn't decided yet, queue the chunk
         if pending['accepted'] is None:
             pending['queued_chunks'][chunk_number] = (encrypted_data, nonce)
             return
         
-        # If declined, ignore
-        if not pending['accepted']:
-            return
-        
         # Accepted - decrypt and add chunk
         try:
-            chunk_data = self.crypto.decrypt_image(
+            chunk_data = await self.decrypt_payload(
+                self.crypto.decrypt_image,
                 from_id,
                 base64.b64decode(encrypted_data),
                 nonce
@@ -474,7 +644,7 @@ class IRCClient:
                 pass
         
         except Exception as e:
-            logger.error(f"Failed to decrypt image chunk: {e}")
+            logger.warning("Failed to decrypt image chunk: %s", e)
     
     async def handle_image_end(self, message: dict):
         """Handle end of image transfer - only save if accepted"""
@@ -530,7 +700,7 @@ class IRCClient:
                     )
                     self.image_transfer.add_chunk(image_id, chunk_num, chunk_data)
                 except Exception as e:
-                    logger.error(f"Failed to decrypt queued chunk: {e}")
+                    logger.warning("Failed to decrypt queued chunk: %s", e)
             
             pending['queued_chunks'].clear()
     
@@ -546,11 +716,7 @@ class IRCClient:
     async def send_private_message(self, target_nickname: str, text: str):
         """Send encrypted private message"""
         # Find user ID
-        target_id = None
-        for uid, info in self.users.items():
-            if info['nickname'] == target_nickname:
-                target_id = uid
-                break
+        target_id = self.user_ids.get(target_nickname)
         
         if not target_id:
             self.print_error(f"User {target_nickname} not found")
@@ -565,10 +731,10 @@ class IRCClient:
         encrypted_data, nonce = self.crypto.encrypt(target_id, text)
         
         # Send
-        msg = Protocol.encrypted_message(
-            self.user_id, target_id, encrypted_data, nonce, is_channel=False
+        msg = Protocol.encrypted_message_bytes(
+            self.get_from_id_field(), target_id, encrypted_data, nonce, is_channel=False
         )
-        await self.send(msg)
+        await self.send_bytes(msg)
     
     async def send_channel_message(self, channel: str, text: str):
         """Send encrypted message to channel"""
@@ -578,25 +744,22 @@ class IRCClient:
         
         # Send encrypted message to each member
         # (In a real implementation, we'd use a shared channel key)
+        from_id_field = self.get_from_id_field()
         for user_id, info in self.users.items():
             if user_id != self.user_id:
                 try:
                     encrypted_data, nonce = self.crypto.encrypt(user_id, text)
-                    msg = Protocol.encrypted_message(
-                        self.user_id, channel, encrypted_data, nonce, is_channel=True
+                    msg = Protocol.encrypted_message_bytes(
+                        from_id_field, channel, encrypted_data, nonce, is_channel=True
                     )
-                    await self.send(msg)
+                    await self.send_bytes(msg)
                 except Exception as e:
-                    logger.error(f"Failed to send to {info['nickname']}: {e}")
+                    logger.warning("Failed to send to %s: %s", info['nickname'], e)
     
     async def send_image(self, target_nickname: str, image_path: str):
         """Send encrypted image to user"""
         # Find user ID
-        target_id = None
-        for uid, info in self.users.items():
-            if info['nickname'] == target_nickname:
-                target_id = uid
-                break
+        target_id = self.user_ids.get(target_nickname)
         
         if not target_id:
             self.print_error(f"User {target_nickname} not found")
@@ -625,14 +788,13 @@ class IRCClient:
             self.print_info(f"Sending image: {filename} ({len(chunks)} chunks)")
             
             # Send chunks
+            from_id_field = self.get_from_id_field()
             for i, chunk in enumerate(chunks):
                 encrypted_chunk, chunk_nonce = self.crypto.encrypt_image(target_id, chunk)
-                msg = Protocol.image_chunk(
-                    self.user_id, target_id, image_id, i,
-                    base64.b64encode(encrypted_chunk).decode('utf-8'),
-                    chunk_nonce
+                msg = Protocol.image_chunk_bytes(
+                    from_id_field, target_id, image_id, i, encrypted_chunk, chunk_nonce
                 )
-                await self.send(msg)
+                await self.send_bytes(msg)
             
             # Send end message
             msg = Protocol.image_end(self.user_id, target_id, image_id)
@@ -671,12 +833,7 @@ class IRCClient:
     
     def print_message(self, sender: str, text: str, private=False, channel=None):
         """Print chat message"""
-        if private:
-            print(f"{Fore.MAGENTA}[PM from {sender}]{Style.RESET_ALL} {text}")
-        elif channel:
-            print(f"{Fore.YELLOW}[{channel}] {sender}:{Style.RESET_ALL} {text}")
-        else:
-            print(f"{Fore.WHITE}{sender}:{Style.RESET_ALL} {text}")
+        print(message_prefix(sender, private, channel), text)
     
     def accept_image_transfer(self, image_id: str, save_path: str):
         """Accept an image transfer and process queued chunks"""
@@ -698,7 +855,7 @@ class IRCClient:
                     )
                     self.image_transfer.add_chunk(image_id, chunk_num, chunk_data)
                 except Exception as e:
-                    logger.error(f"Failed to decrypt queued chunk: {e}")
+                    logger.warning("Failed to decrypt queued chunk: %s", e)
             
             pending['queued_chunks'].clear()
     
@@ -768,7 +925,7 @@ Operators: Channel creators are automatically operators
             except EOFError:
                 break
             except Exception as e:
-                logger.error(f"Input error: {e}")
+                logger.error("Input error: %s", e)
     
     async def handle_command(self, command: str):
         """Handle user command"""
@@ -890,6 +1047,8 @@ Operators: Channel creators are automatically operators
             pass
         finally:
             self.running = False
+            if self._crypto_executor:
+                self._crypto_executor.shutdown(wait=False)
             if self.writer:
                 self.writer.close()
                 await self.writer.wait_closed()
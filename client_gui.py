@@ -4,11 +4,14 @@ Uses Tkinter for cross-platform GUI
 """
 
 import asyncio
+import functools
 import tkinter as tk
-from tkinter import ttk, scrolledtext, filedialog, messagebox
+from tkinter import ttk, filedialog, messagebox
+import tkinter.font as tkfont
 import threading
 import json
 import os
+import sys
 import time
 from datetime import datetime
 from typing import Optional
@@ -18,6 +21,81 @@ from image_transfer import ImageTransfer
 from config_manager import ConfigManager
 
 
+# Bytes buffered in the transport before a send waits for it to flush
+SEND_DRAIN_THRESHOLD = 64 * 1024
+
+# tkinter.colorchooser.askcolor, imported the first time a color is picked
+_askcolor = None
+
+
+def ask_color(title, initial_color):
+    """Open the color chooser, importing it on first use"""
+    global _askcolor
+    if _askcolor is None:
+        from tkinter.colorchooser import askcolor
+        _askcolor = askcolor
+    return _askcolor(color=initial_color, title=title)
+
+
+# (theme name, description) in the order the settings dialog lists them
+THEME_CHOICES = (
+    ("dark", "Dark - Classic dark mode"),
+    ("light", "Light - Bright clean interface"),
+    ("classic", "Classic - Traditional IRC look"),
+    ("cyber", "🛡️ Cyber - Security-themed"),
+    ("custom", "🎨 Custom - User defined colors"),
+)
+
+# Command reference shown by the Help dialog
+HELP_TEXT = """IRC Commands:
+        
+🔹 Basic Commands:
+  /join #channel [join_pwd] [creator_pwd]  - Join/create channel
+    • For new channels: creator_pwd required (4+ chars) to regain operator later
+    • For existing: use creator_pwd to regain operator status  
+    • If only one password: used for both join and creator access
+    • Channel names automatically converted to lowercase
+    • Spaces in names replaced with hyphens
+  /leave [#channel]          - Leave current or specified channel
+  /msg user message          - Send private message
+  /nick newnick              - Change nickname (future)
+  /quit                      - Disconnect and quit
+  
+🔹 Actions & Formatting:
+  /me action                 - Send action (*user does something*)
+  
+🔹 Channel Management:
+  Mods - Can kick users
+  Operators - Can kick, ban, give mod status
+  Owners - All operator powers + give operator status + transfer ownership
+  
+  /op user                   - Grant operator (owner only, requires setting op password)
+  /unop user                 - Remove operator status (owner only)
+  /mod user                  - Grant mod status (operators+)
+  /unmod user                - Remove mod status (operators+)
+  /kick user [reason]        - Kick user from channel (mods+)
+  /ban user [reason]         - Ban user from channel (operators+)
+  /unban user                - Unban user from channel (operators+)
+  /kickban user [reason]     - Kick and ban user (operators+)
+  /transfer user             - Transfer channel ownership (owner only, target must be op)
+  /topic new topic           - Set channel topic (operators+)
+  
+🔹 Information:
+  /users                     - List all online users
+  /whois user                - Get user information and channels
+  /list                      - List all available channels (🔒 = password-protected)
+  
+🔹 File Transfer:
+  /image user path           - Send encrypted image
+  
+💡 Tip: Double-click a user to start private chat
+💡 Tip: Right-click a channel user for quick actions
+💡 Tip: Press Tab to autocomplete nicknames
+💡 Tip: Channel messages are filtered - switch channels to see different conversations
+💡 Tip: Operators need a password - set it when granted op, provide it when rejoining
+"""
+
+
 class IRCClientGUI:
     """GUI IRC Client with E2E encryption"""
     
@@ -47,11 +125,23 @@ class IRCClientGUI:
         self.protected_channels = set()  # Channels that are password-protected
         self.current_channel: Optional[str] = None
         self.current_recipient: Optional[str] = None  # For private messages
-        self.joined_channels = set()
+        # Replaced rather than mutated so the Tk thread always reads a consistent set
+        self.joined_channels = frozenset()
         
         # Pending image transfers waiting for user acceptance
         self.pending_images = {}  # image_id -> {from_id, metadata, chunks_data}
         
+        # Last (text, color) shown in the context label
+        self._context_label_state: Optional[tuple] = None
+        
+        # (dialog, refresh) for the settings window once it has been built
+        self._settings_dialog: Optional[tuple] = None
+        
+        # Shared Tk font objects by (family, size, *styles), see shared_font()
+        self._fonts = {}
+        # Nick tags already configured on the chat display
+        self._nick_tags = set()
+        
         # Event loop
         self.loop: Optional[asyncio.AbstractEventLoop] = None
         self.running = False
@@ -447,44 +537,133 @@ class IRCClientGUI:
         
         style.configure('Border.TFrame', background=border, borderwidth=1)
         
+        # About dialog
+        style.configure('AboutTitle.TLabel', foreground=accent, font=('Arial', 24, 'bold'))
+        style.configure('AboutSubtitle.TLabel', font=('Arial', 12))
+        style.configure('Info.TFrame', background=colors.get("chat_bg", bg), relief=tk.RIDGE, borderwidth=2)
+        style.configure('Info.TLabel', background=colors.get("chat_bg", bg), foreground=colors.get("chat_fg", fg), font=('Consolas', 10))
+        
         style.configure('TPanedwindow', background=bg)
     
     def show_settings(self):
         """Show settings dialog"""
+        # The dialog is built once, then hidden and re-shown on later opens
+        if self._settings_dialog is not None:
+            dialog, refresh = self._settings_dialog
+            if dialog.winfo_exists():
+                refresh()
+                return
+        
         dialog = tk.Toplevel(self.root)
         dialog.title("Settings")
         dialog.geometry("450x500")
         dialog.transient(self.root)
-        dialog.grab_set()
         
-        # Apply theme colors
-        colors = self.config.get_theme_colors()
-        dialog.config(bg=colors['bg'])
+        # Variables are created up front so Save works whichever tabs were opened
+        settings = {
+            'theme': tk.StringVar(),
+            'font_family': tk.StringVar(),
+            'font_size': tk.IntVar(),
+            'timestamps': tk.BooleanVar(),
+            'join_leave': tk.BooleanVar(),
+        }
+        # Chat font when the dialog opened, so Save only re-lays out the chat if it changed
+        prev_font = None
+        
+        def refresh():
+            nonlocal prev_font
+            font = self.config.get_section("font")
+            ui = self.config.get_section("ui")
+            prev_font = (font.get("family", "Consolas"), font.get("chat_size", 10))
+            settings['theme'].set(self.config.get("theme", default="dark"))
+            settings['font_family'].set(prev_font[0])
+            settings['font_size'].set(prev_font[1])
+            settings['timestamps'].set(ui.get("show_timestamps", True))
+            settings['join_leave'].set(ui.get("show_join_leave", True))
+            
+            # Apply theme colors
+            dialog.config(bg=self.config.get_theme_colors()['bg'])
+            dialog.deiconify()
+            dialog.lift()
+            dialog.grab_set()
+        
+        def hide():
+            dialog.grab_release()
+            dialog.withdraw()
+        
+        dialog.protocol("WM_DELETE_WINDOW", hide)
+        self._settings_dialog = (dialog, refresh)
+        refresh()
         
         notebook = ttk.Notebook(dialog)
         notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        # Theme tab
-        theme_frame = ttk.Frame(notebook, padding=20)
-        notebook.add(theme_frame, text="Theme")
+        # Tab contents are built the first time each tab is selected
+        pending_tabs = {}
+        for title, builder in (
+            ("Theme", self._build_theme_tab),
+            ("Font", self._build_font_tab),
+            ("UI Options", self._build_ui_tab),
+        ):
+            frame = ttk.Frame(notebook, padding=20)
+            notebook.add(frame, text=title)
+            pending_tabs[str(frame)] = (builder, frame)
+        
+        def build_selected_tab(event=None):
+            builder, frame = pending_tabs.pop(notebook.select(), (None, None))
+            if not builder:
+                return
+            # Paint the dialog with a busy placeholder first, then fill the tab in when idle
+            loading = ttk.Progressbar(frame, mode='indeterminate')
+            loading.pack(fill=tk.X)
+            loading.start(20)
+            
+            def build():
+                if not frame.winfo_exists():
+                    return
+                loading.stop()
+                loading.destroy()
+                builder(frame, dialog, settings)
+            
+            dialog.after_idle(build)
         
-        ttk.Label(theme_frame, text="Select Theme:", font=('Segoe UI', 10, 'bold')).pack(anchor=tk.W, pady=(0, 10))
+        notebook.bind("<<NotebookTabChanged>>", build_selected_tab)
+        build_selected_tab()
         
-        current_theme = self.config.get("theme", default="dark")
-        theme_var = tk.StringVar(value=current_theme)
+        # Buttons
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
         
-        theme_descriptions = {
-            "dark": "Dark - Classic dark mode",
-            "light": "Light - Bright clean interface",
-            "classic": "Classic - Traditional IRC look",
-            "cyber": "🛡️ Cyber - Security-themed",
-            "custom": "🎨 Custom - User defined colors"
-        }
+        def save_settings():
+            with self.config.batch():
+                self.config.set("theme", value=settings['theme'].get())
+                self.config.set("font", "family", value=settings['font_family'].get())
+                self.config.set("font", "chat_size", value=settings['font_size'].get())
+                self.config.set("ui", "show_timestamps", value=settings['timestamps'].get())
+                self.config.set("ui", "show_join_leave", value=settings['join_leave'].get())
+            self.apply_theme()
+            
+            # Update font
+            font = (settings['font_family'].get(), settings['font_size'].get())
+            if font != prev_font:
+                self.chat_display.config(font=font)
+            
+            hide()
+            messagebox.showinfo("Settings", "Settings saved! Some changes may require restart.")
+        
+        ttk.Button(btn_frame, text="Save", command=save_settings, width=12).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(btn_frame, text="Cancel", command=hide, width=12).pack(side=tk.RIGHT)
+    
+    def _build_theme_tab(self, theme_frame, dialog, settings):
+        """Build the Theme tab of the settings dialog"""
+        theme_var = settings['theme']
+        
+        ttk.Label(theme_frame, text="Select Theme:", font=self.shared_font('Segoe UI', 10, 'bold')).pack(anchor=tk.W, pady=(0, 10))
         
-        for theme_name in ["dark", "light", "classic", "cyber", "custom"]:
+        for theme_name, description in THEME_CHOICES:
             ttk.Radiobutton(
                 theme_frame,
-                text=theme_descriptions[theme_name],
+                text=description,
                 variable=theme_var,
                 value=theme_name
             ).pack(anchor=tk.W, pady=5)
@@ -492,8 +671,7 @@ class IRCClientGUI:
         # Custom Colors Button (Only shown/enabled if custom selected)
         def convert_color(prompt_title, initial_color):
             try:
-                from tkinter.colorchooser import askcolor
-                color = askcolor(color=initial_color, title=prompt_title)
+                color = ask_color(prompt_title, initial_color)
                 return color[1] if color[1] else initial_color
             except:
                 return initial_color
@@ -506,43 +684,39 @@ class IRCClientGUI:
             editor = tk.Toplevel(dialog)
             editor.title("Custom Theme Editor")
             editor.geometry("400x500")
-            editor.config(bg=colors['bg'])
+            editor.config(bg=self.config.get_theme_colors()['bg'])
             
             # Load current custom colors
             current_custom = self.config.get("colors", "custom")
             if not current_custom:
                 current_custom = self.config.get("colors", "dark").copy() # fallback
             
-            # Helper to create color picker row
-            def create_picker(parent, name, key):
-                f = ttk.Frame(parent)
-                f.pack(fill=tk.X, pady=2)
-                ttk.Label(f, text=name, width=20).pack(side=tk.LEFT)
-                
-                # Color preview/button
-                btn = tk.Button(f, bg=current_custom.get(key, '#000000'), width=10)
-                
-                def pick():
-                    new_c = convert_color(f"Pick {name}", current_custom.get(key, '#000000'))
-                    current_custom[key] = new_c
-                    btn.config(bg=new_c)
-                    
-                btn.config(command=pick)
-                btn.pack(side=tk.RIGHT)
+            # One handler serves every row; each button binds its own label and key
+            def pick(btn, name, key):
+                new_c = convert_color(f"Pick {name}", current_custom.get(key, '#000000'))
+                current_custom[key] = new_c
+                btn.config(bg=new_c)
                 
             scroll_frame = ttk.Frame(editor)
             scroll_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
             
-            keys_to_edit = [
+            keys_to_edit = (
                 ("Background", "bg"), ("Foreground", "fg"),
                 ("Chat BG", "chat_bg"), ("Chat FG", "chat_fg"),
                 ("Accent", "accent"), ("Input BG", "input_bg"),
                 ("Info Text", "info"), ("Error Text", "error"),
                 ("Success Text", "success")
-            ]
+            )
             
             for label, key in keys_to_edit:
-                create_picker(scroll_frame, label, key)
+                f = ttk.Frame(scroll_frame)
+                f.pack(fill=tk.X, pady=2)
+                ttk.Label(f, text=label, width=20).pack(side=tk.LEFT)
+                
+                # Color preview/button
+                btn = tk.Button(f, bg=current_custom.get(key, '#000000'), width=10)
+                btn.config(command=functools.partial(pick, btn, label, key))
+                btn.pack(side=tk.RIGHT)
                 
             def save_custom():
                 self.config.set("colors", "custom", value=current_custom)
@@ -553,111 +727,45 @@ class IRCClientGUI:
 
         editor_btn = ttk.Button(theme_frame, text="Customize Colors...", command=open_custom_theme_editor)
         editor_btn.pack(anchor=tk.W, pady=10)
-        
-        # Font tab
-        font_frame = ttk.Frame(notebook, padding=20)
-        notebook.add(font_frame, text="Font")
-        
-        ttk.Label(font_frame, text="Font Family:", font=('Arial', 10, 'bold')).pack(anchor=tk.W, pady=(0, 5))
-        font_family_var = tk.StringVar(value=self.config.get("font", "family", default="Consolas"))
-        font_entry = ttk.Entry(font_frame, textvariable=font_family_var, width=30)
+    
+    def _build_font_tab(self, font_frame, dialog, settings):
+        """Build the Font tab of the settings dialog"""
+        ttk.Label(font_frame, text="Font Family:", font=self.shared_font('Arial', 10, 'bold')).pack(anchor=tk.W, pady=(0, 5))
+        font_entry = ttk.Entry(font_frame, textvariable=settings['font_family'], width=30)
         font_entry.pack(anchor=tk.W, pady=(0, 15))
         
-        ttk.Label(font_frame, text="Chat Font Size:", font=('Arial', 10, 'bold')).pack(anchor=tk.W, pady=(0, 5))
-        font_size_var = tk.IntVar(value=self.config.get("font", "chat_size", default=10))
+        ttk.Label(font_frame, text="Chat Font Size:", font=self.shared_font('Arial', 10, 'bold')).pack(anchor=tk.W, pady=(0, 5))
         ttk.Scale(
             font_frame,
             from_=8,
             to=16,
-            variable=font_size_var,
+            variable=settings['font_size'],
             orient=tk.HORIZONTAL,
             length=200
         ).pack(anchor=tk.W)
-        
-        # UI Options tab
-        ui_frame = ttk.Frame(notebook, padding=20)
-        notebook.add(ui_frame, text="UI Options")
-        
-        timestamps_var = tk.BooleanVar(value=self.config.get("ui", "show_timestamps", default=True))
-        join_leave_var = tk.BooleanVar(value=self.config.get("ui", "show_join_leave", default=True))
-        
-        ttk.Checkbutton(ui_frame, text="Show timestamps", variable=timestamps_var).pack(anchor=tk.W, pady=5)
-        ttk.Checkbutton(ui_frame, text="Show join/leave messages", variable=join_leave_var).pack(anchor=tk.W, pady=5)
-        
-        # Buttons
-        btn_frame = ttk.Frame(dialog)
-        btn_frame.pack(fill=tk.X, padx=10, pady=10)
-        
-        def save_settings():
-            self.config.set("theme", value=theme_var.get())
-            self.config.set("font", "family", value=font_family_var.get())
-            self.config.set("font", "chat_size", value=font_size_var.get())
-            self.config.set("ui", "show_timestamps", value=timestamps_var.get())
-            self.config.set("ui", "show_join_leave", value=join_leave_var.get())
-            self.apply_theme()
-            
-            # Update font
-            font_family = font_family_var.get()
-            font_size = font_size_var.get()
-            self.chat_display.config(font=(font_family, font_size))
-            
-            dialog.destroy()
-            dialog.destroy()
-            messagebox.showinfo("Settings", "Settings saved! Some changes may require restart.")
-        
-        ttk.Button(btn_frame, text="Save", command=save_settings, width=12).pack(side=tk.RIGHT, padx=5)
-        ttk.Button(btn_frame, text="Cancel", command=dialog.destroy, width=12).pack(side=tk.RIGHT)
+    
+    def _build_ui_tab(self, ui_frame, dialog, settings):
+        """Build the UI Options tab of the settings dialog"""
+        ttk.Checkbutton(ui_frame, text="Show timestamps", variable=settings['timestamps']).pack(anchor=tk.W, pady=5)
+        ttk.Checkbutton(ui_frame, text="Show join/leave messages", variable=settings['join_leave']).pack(anchor=tk.W, pady=5)
+    
+    def shared_font(self, family, size, *styles):
+        """Return one Tk font object per font spec instead of re-parsing tuples"""
+        key = (family, size) + styles
+        font = self._fonts.get(key)
+        if font is None:
+            font = tkfont.Font(
+                root=self.root,
+                family=family,
+                size=size,
+                weight='bold' if 'bold' in styles else 'normal',
+                slant='italic' if 'italic' in styles else 'roman'
+            )
+            self._fonts[key] = font
+        return font
     
     def show_help(self):
         """Show help dialog with command list"""
-        help_text = """IRC Commands:
-        
-🔹 Basic Commands:
-  /join #channel [join_pwd] [creator_pwd]  - Join/create channel
-    • For new channels: creator_pwd required (4+ chars) to regain operator later
-    • For existing: use creator_pwd to regain operator status  
-    • If only one password: used for both join and creator access
-    • Channel names automatically converted to lowercase
-    • Spaces in names replaced with hyphens
-  /leave [#channel]          - Leave current or specified channel
-  /msg user message          - Send private message
-  /nick newnick              - Change nickname (future)
-  /quit                      - Disconnect and quit
-  
-🔹 Actions & Formatting:
-  /me action                 - Send action (*user does something*)
-  
-🔹 Channel Management:
-  Mods - Can kick users
-  Operators - Can kick, ban, give mod status
-  Owners - All operator powers + give operator status + transfer ownership
-  
-  /op user                   - Grant operator (owner only, requires setting op password)
-  /unop user                 - Remove operator status (owner only)
-  /mod user                  - Grant mod status (operators+)
-  /unmod user                - Remove mod status (operators+)
-  /kick user [reason]        - Kick user from channel (mods+)
-  /ban user [reason]         - Ban user from channel (operators+)
-  /unban user                - Unban user from channel (operators+)
-  /kickban user [reason]     - Kick and ban user (operators+)
-  /transfer user             - Transfer channel ownership (owner only, target must be op)
-  /topic new topic           - Set channel topic (operators+)
-  
-🔹 Information:
-  /users                     - List all online users
-  /whois user                - Get user information and channels
-  /list                      - List all available channels (🔒 = password-protected)
-  
-🔹 File Transfer:
-  /image user path           - Send encrypted image
-  
-💡 Tip: Double-click a user to start private chat
-💡 Tip: Right-click a channel user for quick actions
-💡 Tip: Press Tab to autocomplete nicknames
-💡 Tip: Channel messages are filtered - switch channels to see different conversations
-💡 Tip: Operators need a password - set it when granted op, provide it when rejoining
-"""
-        
         dialog = tk.Toplevel(self.root)
         dialog.title("IRC Commands Help")
         dialog.geometry("600x500")
@@ -667,13 +775,18 @@ class IRCClientGUI:
         colors = self.config.get_theme_colors()
         dialog.config(bg=colors['bg'])
         
-        text = scrolledtext.ScrolledText(dialog, wrap=tk.WORD, font=('Consolas', 10),
-                                         bg=colors['chat_bg'], fg=colors['chat_fg'])
-        text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        text.insert('1.0', help_text)
+        # Static text needs only a plain Text and scrollbar, not a ScrolledText frame
+        ttk.Button(dialog, text="Close", command=dialog.destroy).pack(side=tk.BOTTOM, pady=10)
+        scrollbar = ttk.Scrollbar(dialog, orient=tk.VERTICAL)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=10)
+        text = tk.Text(dialog, wrap=tk.WORD, font=('Consolas', 10),
+                       undo=False, autoseparators=False, maxundo=0,
+                       bg=colors['chat_bg'], fg=colors['chat_fg'],
+                       yscrollcommand=scrollbar.set)
+        text.pack(fill=tk.BOTH, expand=True, padx=(10, 0), pady=10)
+        scrollbar.config(command=text.yview)
+        text.insert('1.0', HELP_TEXT)
         text.config(state=tk.DISABLED)
-        
-        ttk.Button(dialog, text="Close", command=dialog.destroy).pack(pady=10)
     
     def show_about(self):
         """Show about dialog with logo"""
@@ -689,7 +802,7 @@ class IRCClientGUI:
         dialog.config(bg=colors['bg'])
         
         # Create logo area
-        logo_frame = tk.Frame(dialog, bg=colors['bg'], height=120)
+        logo_frame = ttk.Frame(dialog, height=120)
         logo_frame.pack(fill=tk.X, pady=20)
         
         # Create a simple shield logo
@@ -725,27 +838,15 @@ class IRCClientGUI:
         except:
             pass
         
-        # App title
-        title_label = tk.Label(
-            dialog,
-            text="🛡️ JustIRC",
-            font=('Arial', 24, 'bold'),
-            bg=colors['bg'],
-            fg=colors['accent']
-        )
+        # App title (labels, frame and button use the styles from apply_theme)
+        title_label = ttk.Label(dialog, text="🛡️ JustIRC", style='AboutTitle.TLabel')
         title_label.pack(pady=(0, 10))
         
-        subtitle_label = tk.Label(
-            dialog,
-            text="Secure Encrypted IRC",
-            font=('Arial', 12),
-            bg=colors['bg'],
-            fg=colors['fg']
-        )
+        subtitle_label = ttk.Label(dialog, text="Secure Encrypted IRC", style='AboutSubtitle.TLabel')
         subtitle_label.pack(pady=(0, 20))
         
         # Info frame
-        info_frame = tk.Frame(dialog, bg=colors['chat_bg'], relief=tk.RIDGE, borderwidth=2)
+        info_frame = ttk.Frame(dialog, style='Info.TFrame')
         info_frame.pack(fill=tk.BOTH, expand=True, padx=30, pady=10)
         
         info_text = (
@@ -763,28 +864,22 @@ class IRCClientGUI:
             "The server cannot decrypt your communications!"
         )
         
-        info_label = tk.Label(
+        info_label = ttk.Label(
             info_frame,
             text=info_text,
             justify=tk.LEFT,
-            font=('Consolas', 10),
-            bg=colors['chat_bg'],
-            fg=colors['chat_fg'],
-            padx=20,
-            pady=20
+            style='Info.TLabel',
+            padding=20
         )
         info_label.pack()
         
         # Close button
-        close_btn = tk.Button(
+        close_btn = ttk.Button(
             dialog,
             text="Close",
             command=dialog.destroy,
-            font=('Arial', 10),
-            bg=colors['accent'],
-            fg='white',
-            padx=30,
-            pady=5
+            style='Action.TButton',
+            padding=(30, 5)
         )
         close_btn.pack(pady=20)
     
@@ -891,7 +986,7 @@ class IRCClientGUI:
         colors = self.config.get_theme_colors()
         dialog.config(bg=colors['bg'])
         
-        ttk.Label(dialog, text=f"Grant operator status to {target_nickname}", font=('Arial', 10, 'bold')).pack(pady=15)
+        ttk.Label(dialog, text=f"Grant operator status to {target_nickname}", font=self.shared_font('Arial', 10, 'bold')).pack(pady=15)
         
         ttk.Label(dialog, text="Set operator password for user (4+ chars):").pack(anchor=tk.W, padx=20)
         password_entry = ttk.Entry(dialog, width=40, show='*')
@@ -936,7 +1031,7 @@ class IRCClientGUI:
         else:
             prompt_text = f"Enter your operator password for {channel}:"
         
-        ttk.Label(dialog, text=prompt_text, font=('Arial', 10, 'bold')).pack(pady=15)
+        ttk.Label(dialog, text=prompt_text, font=self.shared_font('Arial', 10, 'bold')).pack(pady=15)
         
         password_entry = ttk.Entry(dialog, width=40, show='*')
         password_entry.pack(padx=20, fill=tk.X, pady=5)
@@ -991,7 +1086,7 @@ class IRCClientGUI:
         colors = self.config.get_theme_colors()
         dialog.config(bg=colors['bg'])
         
-        ttk.Label(dialog, text=f"Kick {target_nickname} from {self.current_channel}?", font=('Arial', 10, 'bold')).pack(pady=15)
+        ttk.Label(dialog, text=f"Kick {target_nickname} from {self.current_channel}?", font=self.shared_font('Arial', 10, 'bold')).pack(pady=15)
         
         ttk.Label(dialog, text="Reason (optional):").pack(anchor=tk.W, padx=20)
         reason_entry = ttk.Entry(dialog, width=40)
@@ -1030,12 +1125,17 @@ class IRCClientGUI:
             self.chat_display.insert(tk.END, f"[{channel}] ", "channel")
         
         # Determine sender color and tag
-        nick_color = self.config.get_nick_color(sender)
         nick_tag = f"nick_{sender}"
-        try:
-            self.chat_display.tag_config(nick_tag, foreground=nick_color, font=('Consolas', 10, 'bold'))
-        except:
-            pass
+        if nick_tag not in self._nick_tags:
+            try:
+                self.chat_display.tag_config(
+                    nick_tag,
+                    foreground=self.config.get_nick_color(sender),
+                    font=self.shared_font('Consolas', 10, 'bold')
+                )
+                self._nick_tags.add(nick_tag)
+            except:
+                pass
             
         # Insert Nickname
         if msg_type == "action":
@@ -1068,6 +1168,17 @@ class IRCClientGUI:
         self.chat_display.see(tk.END)
         self.chat_display.config(state=tk.DISABLED)
     
+    def run_on_ui(self, *callbacks):
+        """Schedule several UI updates from the network thread as one Tk event"""
+        def run_all():
+            for callback in callbacks:
+                try:
+                    callback()
+                except Exception:
+                    self.root.report_callback_exception(*sys.exc_info())
+        
+        self.root.after(0, run_all)
+    
     def set_status(self, status: str):
         """Update status bar"""
         self.status_var.set(status)
@@ -1128,12 +1239,15 @@ class IRCClientGUI:
             self.connected = True
             
             # Save last server to config
-            self.config.set("server", "last_server", value=server)
-            self.config.set("server", "last_port", value=str(port))
-            
-            self.root.after(0, lambda: self.set_status(f"Connected to {server}:{port}"))
-            self.root.after(0, lambda: self.log(f"Connected to {server}:{port}", "success"))
-            self.root.after(0, self.update_context_label)
+            with self.config.batch():
+                self.config.set("server", "last_server", value=server)
+                self.config.set("server", "last_port", value=str(port))
+            
+            self.run_on_ui(
+                lambda: self.set_status(f"Connected to {server}:{port}"),
+                lambda: self.log(f"Connected to {server}:{port}", "success"),
+                self.update_context_label
+            )
             
             # Register
             public_key = self.crypto.get_public_key_b64()
@@ -1169,8 +1283,13 @@ class IRCClientGUI:
     async def send_to_server(self, message: str):
         """Send message to server"""
         if self.writer and self.connected:
-            self.writer.write(message.encode('utf-8') + b'\n')
-            await self.writer.drain()
+            self.writer.writelines((message.encode('utf-8'), b'\n'))
+            
+            # Small frames go out in the same loop turn; only wait for the
+            # transport once it is holding data back or the connection is closing
+            transport = self.writer.transport
+            if transport.get_write_buffer_size() > SEND_DRAIN_THRESHOLD or transport.is_closing():
+                await self.writer.drain()
     
     async def handle_message(self, message: dict):
         """Handle incoming message"""
@@ -1189,7 +1308,7 @@ class IRCClientGUI:
             
             elif 'channel' in message:
                 channel = message['channel']
-                self.joined_channels.add(channel)
+                self.joined_channels = self.joined_channels | {channel}
                 self.current_channel = channel
                 
                 # Track if channel is password-protected
@@ -1238,10 +1357,12 @@ class IRCClientGUI:
                                 'public_key': member['public_key']
                             }
                 
-                self.root.after(0, self._update_channel_list)
-                self.root.after(0, self._update_channel_user_list)
-                self.root.after(0, self.update_context_label)
-                self.root.after(0, lambda: self.log(f"Joined {channel} ({len(members)} members)", "success"))
+                self.run_on_ui(
+                    self._update_channel_list,
+                    self._update_channel_user_list,
+                    self.update_context_label,
+                    lambda: self.log(f"Joined {channel} ({len(members)} members)", "success")
+                )
         
         elif msg_type == MessageType.USER_LIST.value:
             users = message.get('users', [])
@@ -1252,8 +1373,10 @@ class IRCClientGUI:
                 }
                 self.crypto.load_peer_public_key(user['user_id'], user['public_key'])
             
-            self.root.after(0, self._update_user_list)
-            self.root.after(0, lambda: self.log(f"{len(users)} users online", "info"))
+            self.run_on_ui(
+                self._update_user_list,
+                lambda: self.log(f"{len(users)} users online", "info")
+            )
         
         elif msg_type == MessageType.PRIVATE_MESSAGE.value:
             from_id = message['from_id']
@@ -1340,12 +1463,16 @@ class IRCClientGUI:
                 if public_key:
                     self.crypto.load_peer_public_key(user_id, public_key)
                 
-                self.root.after(0, self._update_user_list)
-                self.root.after(0, lambda: self.log(f"{nickname} joined {channel}", "system"))
+                updates = [
+                    self._update_user_list,
+                    lambda: self.log(f"{nickname} joined {channel}", "system")
+                ]
                 
                 # Update channel user list if viewing this channel
                 if self.current_channel == channel:
-                    self.root.after(0, self._update_channel_user_list)
+                    updates.append(self._update_channel_user_list)
+                
+                self.run_on_ui(*updates)
         
         elif msg_type == MessageType.LEAVE_CHANNEL.value:
             user_id = message.get('user_id')
@@ -1356,11 +1483,13 @@ class IRCClientGUI:
             if channel in self.channel_users and user_id:
                 self.channel_users[channel].discard(user_id)
             
-            self.root.after(0, lambda: self.log(f"{nickname} left {channel}", "system"))
+            updates = [lambda: self.log(f"{nickname} left {channel}", "system")]
             
             # Update channel user list if viewing this channel
             if self.current_channel == channel:
-                self.root.after(0, self._update_channel_user_list)
+                updates.append(self._update_channel_user_list)
+            
+            self.run_on_ui(*updates)
         
         elif msg_type == MessageType.DISCONNECT.value:
             user_id = message.get('user_id')
@@ -1375,11 +1504,12 @@ class IRCClientGUI:
                 channel.discard(user_id)
             
             # Update both user lists
-            self.root.after(0, self._update_user_list)
+            updates = [self._update_user_list]
             if self.current_channel:
-                self.root.after(0, self._update_channel_user_list)
+                updates.append(self._update_channel_user_list)
+            updates.append(lambda: self.log(f"{nickname} disconnected", "system"))
             
-            self.root.after(0, lambda n=nickname: self.log(f"{n} disconnected", "system"))
+            self.run_on_ui(*updates)
         
         elif msg_type == MessageType.IMAGE_START.value:
             await self.handle_image_start(message)
@@ -1475,8 +1605,7 @@ class IRCClientGUI:
             reason = message.get('reason', 'No reason given')
             
             # Remove from joined channels
-            if channel in self.joined_channels:
-                self.joined_channels.remove(channel)
+            self.joined_channels = self.joined_channels - {channel}
             
             # Clear channel data
             if channel in self.channel_users:
@@ -1486,13 +1615,17 @@ class IRCClientGUI:
             if channel in self.channel_mods:
                 del self.channel_mods[channel]
             
+            updates = [
+                lambda: self.log(f"You were kicked from {channel} by {kicked_by}: {reason}", "error"),
+                self._update_channel_list
+            ]
+            
             # If viewing this channel, clear it
             if self.current_channel == channel:
                 self.current_channel = None
-                self.root.after(0, self.update_context_label)
+                updates.append(self.update_context_label)
             
-            self.root.after(0, lambda: self.log(f"You were kicked from {channel} by {kicked_by}: {reason}", "error"))
-            self.root.after(0, self._update_channel_list)
+            self.run_on_ui(*updates)
         
         elif msg_type == MessageType.BAN_USER.value:
             # You were banned from a channel
@@ -1501,8 +1634,7 @@ class IRCClientGUI:
             reason = message.get('reason', 'No reason given')
             
             # Remove from joined channels
-            if channel in self.joined_channels:
-                self.joined_channels.remove(channel)
+            self.joined_channels = self.joined_channels - {channel}
             
             # Clear channel data
             if channel in self.channel_users:
@@ -1512,13 +1644,17 @@ class IRCClientGUI:
             if channel in self.channel_mods:
                 del self.channel_mods[channel]
             
+            updates = [
+                lambda: self.log(f"You were BANNED from {channel} by {banned_by}: {reason}", "error"),
+                self._update_channel_list
+            ]
+            
             # If viewing this channel, clear it
             if self.current_channel == channel:
                 self.current_channel = None
-                self.root.after(0, self.update_context_label)
+                updates.append(self.update_context_label)
             
-            self.root.after(0, lambda: self.log(f"You were BANNED from {channel} by {banned_by}: {reason}", "error"))
-            self.root.after(0, self._update_channel_list)
+            self.run_on_ui(*updates)
         
         elif msg_type == MessageType.UNBAN_USER.value:
             # You were unbanned from a channel
@@ -1608,10 +1744,13 @@ class IRCClientGUI:
             display_name = self.channel_list.get(idx)
             # Strip padlock emoji if present
             channel = display_name.replace('🔒 ', '')
-            self.current_channel = channel
-            self.current_recipient = None  # Clear PM mode
+            # Re-selecting the active channel leaves the send context as it is
+            if channel != self.current_channel or self.current_recipient is not None:
+                self.current_channel = channel
+                self.current_recipient = None  # Clear PM mode
+                self.update_context_label()
+            # Always restore the status bar and refresh the member list
             self.set_status(f"Channel: {self.current_channel}")
-            self.update_context_label()
             self._update_channel_user_list()  # Update channel users display
     
     def on_user_double_click(self, event):
@@ -2108,15 +2247,14 @@ class IRCClientGUI:
         msg = Protocol.leave_channel(self.user_id, channel)
         await self.send_to_server(msg)
         
-        self.joined_channels.discard(channel)
+        self.joined_channels = self.joined_channels - {channel}
         if channel in self.channel_users:
             del self.channel_users[channel]
         
         if self.current_channel == channel:
             self.current_channel = None
         
-        self.root.after(0, self._update_channel_list)
-        self.root.after(0, self._update_channel_user_list)
+        self.run_on_ui(self._update_channel_list, self._update_channel_user_list)
     
     def send_image_dialog(self):
         """Show send image dialog"""
@@ -2240,18 +2378,20 @@ class IRCClientGUI:
     
     async def handle_image_chunk(self, message: dict):
         """Handle image chunk - only process if accepted"""
+        # Check if this is a pending/accepted transfer before reading the rest
+        pending = self.pending_images.get(message['image_id'])
+        if pending is None:
+            return  # Unknown transfer, ignore
+        
+        # If user declined, ignore chunks
+        if pending['accepted'] is False:
+            return
+        
         from_id = message['from_id']
-        image_id = message['image_id']
         chunk_number = message['chunk_number']
         encrypted_data = message['encrypted_data']
         nonce = message['nonce']
         
-        # Check if this is a pending/accepted transfer
-        if image_id not in self.pending_images:
-            return  # Unknown transfer, ignore
-        
-        pending = self.pending_images[image_id]
-        
         # If user hasn't decided yet, queue the chunk
         if pending['accepted'] is None:
             # Store encrypted chunk for later processing
@@ -2260,10 +2400,6 @@ class IRCClientGUI:
             pending['queued_chunks'][chunk_number] = (encrypted_data, nonce)
             return
         
-        # If user declined, ignore chunks
-        if not pending['accepted']:
-            return
-        
         # User accepted, decrypt and store chunk
         try:
             import base64
@@ -2410,13 +2546,21 @@ class IRCClientGUI:
     def update_context_label(self):
         """Update the context label showing where messages will be sent"""
         if not self.connected:
-            self.context_label.config(text="Not connected", foreground='gray')
+            context = ("Not connected", 'gray')
         elif self.current_channel:
-            self.context_label.config(text=f"Channel: {self.current_channel}", foreground='orange')
+            context = (f"Channel: {self.current_channel}", 'orange')
         elif self.current_recipient:
-            self.context_label.config(text=f"PM to {self.current_recipient}", foreground='magenta')
+            context = (f"PM to {self.current_recipient}", 'magenta')
         else:
-            self.context_label.config(text="Select a channel or user", foreground='gray')
+            context = ("Select a channel or user", 'gray')
+        
+        # Skip reconfiguring the widget when the target is unchanged
+        if context == self._context_label_state:
+            return
+        self._context_label_state = context
+        
+        text, foreground = context
+        self.context_label.config(text=text, foreground=foreground)
     
     def disconnect(self):
         """Disconnect from server"""
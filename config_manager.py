@@ -3,11 +3,30 @@ Configuration Manager for JustIRC GUI Client
 Handles loading and saving user preferences
 """
 
+import functools
+import hashlib
 import json
 import os
+from contextlib import contextmanager
 from typing import Dict, Any
 
 
+# Readable colors for dark/light themes, picked by nickname hash
+NICK_COLORS = (
+    "#FF7F50", "#20B2AA", "#9370DB", "#3CB371", "#1E90FF",
+    "#CD5C5C", "#DA70D6", "#00FA9A", "#4169E1", "#FF69B4",
+    "#87CEEB", "#DDA0DD", "#F08080", "#7B68EE", "#00CED1",
+    "#FF8C00", "#6A5ACD", "#40E0D0", "#C71585", "#32CD32"
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def nick_color(nickname: str) -> str:
+    """Color for a nickname; cached since it is looked up for every chat line"""
+    hash_val = int(hashlib.sha256(nickname.encode()).hexdigest(), 16)
+    return NICK_COLORS[hash_val % len(NICK_COLORS)]
+
+
 class ConfigManager:
     """Manages client configuration"""
     
@@ -130,6 +149,9 @@ class ConfigManager:
     def __init__(self, config_path: str = "justirc_config.json"):
         self.config_path = config_path
         self.config = self.load_config()
+        # Nesting depth of batch() blocks and whether a set() is waiting to be saved
+        self._batch_depth = 0
+        self._batch_dirty = False
     
     def load_config(self) -> Dict[str, Any]:
         """Load configuration from file"""
@@ -171,6 +193,11 @@ class ConfigManager:
                 return default
         return value
     
+    def get_section(self, name: str) -> Dict[str, Any]:
+        """Get a shallow copy of a top-level config section (empty if missing)"""
+        section = self.config.get(name)
+        return dict(section) if isinstance(section, dict) else {}
+    
     def set(self, *keys, value):
         """Set a config value by path"""
         config = self.config
@@ -179,24 +206,26 @@ class ConfigManager:
                 config[key] = {}
             config = config[key]
         config[keys[-1]] = value
-        self.save_config()
+        if self._batch_depth:
+            self._batch_dirty = True
+        else:
+            self.save_config()
+    
+    @contextmanager
+    def batch(self):
+        """Group several set() calls into a single save when the block exits"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._batch_dirty:
+                self._batch_dirty = False
+                self.save_config()
     
     def get_nick_color(self, nickname: str) -> str:
         """Generate a consistent color for a nickname based on hash"""
-        import hashlib
-        
-        # List of readable colors for dark/light themes
-        # We'll select based on HSL to ensure visibility or just a curated list
-        colors = [
-            "#FF7F50", "#20B2AA", "#9370DB", "#3CB371", "#1E90FF",
-            "#CD5C5C", "#DA70D6", "#00FA9A", "#4169E1", "#FF69B4",
-            "#87CEEB", "#DDA0DD", "#F08080", "#7B68EE", "#00CED1",
-            "#FF8C00", "#6A5ACD", "#40E0D0", "#C71585", "#32CD32"
-        ]
-        
-        # Simple hash to pick index
-        hash_val = int(hashlib.sha256(nickname.encode()).hexdigest(), 16)
-        return colors[hash_val % len(colors)]
+        return nick_color(nickname)
 
     def get_role_symbol(self, is_owner: bool = False, is_op: bool = False, is_mod: bool = False) -> str:
         """Get symbol for user role"""
@@ -57,6 +57,13 @@ class CryptoLayer:
         """Load a peer's public key from base64"""
         try:
             public_key_bytes = base64.b64decode(public_key_b64)
+        except Exception as e:
+            raise ValueError(f"Failed to load peer public key: {e}")
+        self.load_peer_public_key_bytes(peer_id, public_key_bytes)
+    
+    def load_peer_public_key_bytes(self, peer_id: str, public_key_bytes: bytes):
+        """Load a peer's raw public key bytes"""
+        try:
             peer_public_key = X25519PublicKey.from_public_bytes(public_key_bytes)
             self.peer_public_keys[peer_id] = peer_public_key
             
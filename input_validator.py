@@ -15,6 +15,9 @@ class InputValidator:
     CHANNEL_PATTERN = re.compile(r'^#[a-zA-Z0-9_-]{1,50}$')
     EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
     
+    # Nicknames nobody may use (compared case-insensitively)
+    RESERVED_NICKNAMES = frozenset({'server', 'admin', 'root', 'system'})
+    
     # Maximum lengths
     MAX_MESSAGE_LENGTH = 4096
     MAX_TOPIC_LENGTH = 256
@@ -45,8 +48,7 @@ class InputValidator:
             return (False, "Nickname can only contain letters, numbers, _ and -")
         
         # Check for reserved names
-        reserved = ['server', 'admin', 'root', 'system']
-        if nickname.lower() in reserved:
+        if nickname.lower() in InputValidator.RESERVED_NICKNAMES:
             return (False, f"Nickname '{nickname}' is reserved")
         
         return (True, None)
@@ -3,6 +3,7 @@ Protocol definitions for JustIRC
 Defines message types and structures
 """
 
+import base64
 import json
 import time
 from typing import Dict, Any, Optional
@@ -206,6 +207,53 @@ class Protocol:
             nonce=nonce
         )
     
+    @staticmethod
+    def encode_field(name: str, value: Any) -> bytes:
+        """Pre-encode a JSON object member for reuse across messages"""
+        return json.dumps({name: value})[1:-1].encode('utf-8')
+    
+    @staticmethod
+    def encrypted_message_bytes(from_id_field: bytes, to_id: str,
+                                encrypted_data: str, nonce: str,
+                                is_channel: bool = False) -> bytes:
+        """Create an encrypted message from a pre-encoded from_id field
+        
+        Equivalent to encrypted_message() but skips re-encoding the constant
+        envelope and sender on every send. from_id_field comes from
+        encode_field("from_id", user_id).
+        """
+        msg_type = MessageType.CHANNEL_MESSAGE if is_channel else MessageType.PRIVATE_MESSAGE
+        return b''.join((
+            _ENVELOPE_PREFIXES[msg_type],
+            json.dumps(time.time()).encode('ascii'),
+            b', ', from_id_field,
+            b', "to_id": ', json.dumps(to_id).encode('utf-8'),
+            b', "encrypted_data": ', json.dumps(encrypted_data).encode('utf-8'),
+            b', "nonce": ', json.dumps(nonce).encode('utf-8'),
+            b'}'
+        ))
+    
+    @staticmethod
+    def image_chunk_bytes(from_id_field: bytes, to_id: str, image_id: str,
+                          chunk_number: int, encrypted_chunk: bytes, nonce: str) -> bytes:
+        """Create an image chunk message from raw ciphertext
+        
+        Equivalent to image_chunk() with base64-encoded data, but the base64
+        bytes are placed straight into the frame instead of round-tripping
+        through str and json.dumps. Base64 output never needs JSON escaping.
+        """
+        return b''.join((
+            _ENVELOPE_PREFIXES[MessageType.IMAGE_CHUNK],
+            json.dumps(time.time()).encode('ascii'),
+            b', ', from_id_field,
+            b', "to_id": ', json.dumps(to_id).encode('utf-8'),
+            b', "image_id": ', json.dumps(image_id).encode('utf-8'),
+            b', "chunk_number": ', str(int(chunk_number)).encode('ascii'),
+            b', "encrypted_data": "', base64.b64encode(encrypted_chunk),
+            b'", "nonce": ', json.dumps(nonce).encode('utf-8'),
+            b'}'
+        ))
+    
     @staticmethod
     def join_channel(user_id: str, channel: str, password: str = None, creator_password: str = None) -> str:
         """Create a join channel message"""
@@ -345,3 +393,15 @@ class Protocol:
             channel=channel,
             topic=topic
         )
+
+
+# Constant leading bytes of pre-encoded messages, up to the timestamp value
+_ENVELOPE_PREFIXES = {
+    msg_type: (
+        '{"version": %s, "type": %s, "timestamp": '
+        % (json.dumps(Protocol.VERSION), json.dumps(msg_type.value))
+    ).encode('utf-8')
+    for msg_type in (
+        MessageType.PRIVATE_MESSAGE, MessageType.CHANNEL_MESSAGE, MessageType.IMAGE_CHUNK
+    )
+}
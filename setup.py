@@ -4,7 +4,7 @@ Setup script for JustIRC
 Build .deb package with: python3 setup.py --command-packages=stdeb.command bdist_deb
 """
 
-from setuptools import setup, find_packages
+from setuptools import setup
 import os
 
 # Read README for long description
@@ -32,8 +32,7 @@ setup(
     url='https://github.com/larry-lines/justIRC',
     license='MIT',
     
-    # Package data
-    packages=find_packages(),
+    # Top-level modules (there are no packages to search for)
     py_modules=[
         'server',
         'client',
@@ -42,14 +41,12 @@ setup(
         'protocol',
         'image_transfer',
         'config_manager',
+        'rate_limiter',
+        'auth_manager',
+        'input_validator',
+        'ip_filter',
     ],
     
-    # Include non-Python files
-    package_data={
-        '': ['*.png', '*.md', '*.txt'],
-    },
-    include_package_data=True,
-    
     # Dependencies
     install_requires=requirements,
     
@@ -4,11 +4,15 @@ Test suite for JustIRC
 Tests crypto layer, protocol, and basic functionality
 """
 
+import sys
 import unittest
-import asyncio
-import json
 from crypto_layer import CryptoLayer, ChannelCrypto
 from protocol import Protocol, MessageType
+from tests.test_crypto_layer import FLIP_LOW_BIT
+
+
+# Fake PNG header + data for the image encryption test
+FAKE_PNG = b'\x89PNG\r\n\x1a\n' + bytes(1000)
 
 
 class TestCryptoLayer(unittest.TestCase):
@@ -19,6 +23,11 @@ class TestCryptoLayer(unittest.TestCase):
         self.alice = CryptoLayer()
         self.bob = CryptoLayer()
     
+    def exchange_keys(self):
+        """Load Alice's and Bob's public keys into each other"""
+        self.alice.load_peer_public_key("bob", self.bob.get_public_key_b64())
+        self.bob.load_peer_public_key("alice", self.alice.get_public_key_b64())
+    
     def test_key_generation(self):
         """Test that keys are generated correctly"""
         alice_pub = self.alice.get_public_key_b64()
@@ -31,12 +40,7 @@ class TestCryptoLayer(unittest.TestCase):
     
     def test_key_exchange(self):
         """Test key exchange between two parties"""
-        # Exchange public keys
-        alice_pub = self.alice.get_public_key_b64()
-        bob_pub = self.bob.get_public_key_b64()
-        
-        self.alice.load_peer_public_key("bob", bob_pub)
-        self.bob.load_peer_public_key("alice", alice_pub)
+        self.exchange_keys()
         
         # Verify shared secrets exist
         self.assertTrue(self.alice.has_peer_key("bob"))
@@ -44,12 +48,7 @@ class TestCryptoLayer(unittest.TestCase):
     
     def test_encryption_decryption(self):
         """Test message encryption and decryption"""
-        # Exchange keys
-        alice_pub = self.alice.get_public_key_b64()
-        bob_pub = self.bob.get_public_key_b64()
-        
-        self.alice.load_peer_public_key("bob", bob_pub)
-        self.bob.load_peer_public_key("alice", alice_pub)
+        self.exchange_keys()
         
         # Alice encrypts message to Bob
         plaintext = "Hello Bob, this is a secret message!"
@@ -81,11 +80,7 @@ class TestCryptoLayer(unittest.TestCase):
     
     def test_tampering_detection(self):
         """Test that tampering is detected"""
-        alice_pub = self.alice.get_public_key_b64()
-        bob_pub = self.bob.get_public_key_b64()
-        
-        self.alice.load_peer_public_key("bob", bob_pub)
-        self.bob.load_peer_public_key("alice", alice_pub)
+        self.exchange_keys()
         
         plaintext = "Important message"
         encrypted, nonce = self.alice.encrypt("bob", plaintext)
@@ -93,7 +88,7 @@ class TestCryptoLayer(unittest.TestCase):
         # Tamper with the ciphertext
         import base64
         encrypted_bytes = base64.b64decode(encrypted)
-        tampered_bytes = bytes([b ^ 1 for b in encrypted_bytes])
+        tampered_bytes = encrypted_bytes.translate(FLIP_LOW_BIT)
         tampered_encrypted = base64.b64encode(tampered_bytes).decode('utf-8')
         
         # Decryption should fail
@@ -102,22 +97,15 @@ class TestCryptoLayer(unittest.TestCase):
     
     def test_image_encryption(self):
         """Test image encryption and decryption"""
-        alice_pub = self.alice.get_public_key_b64()
-        bob_pub = self.bob.get_public_key_b64()
-        
-        self.alice.load_peer_public_key("bob", bob_pub)
-        self.bob.load_peer_public_key("alice", alice_pub)
-        
-        # Simulate image data
-        image_data = b'\x89PNG\r\n\x1a\n' + b'\x00' * 1000  # Fake PNG header + data
+        self.exchange_keys()
         
         # Encrypt
-        encrypted, nonce = self.alice.encrypt_image("bob", image_data)
+        encrypted, nonce = self.alice.encrypt_image("bob", FAKE_PNG)
         
         # Decrypt
         decrypted = self.bob.decrypt_image("alice", encrypted, nonce)
         
-        self.assertEqual(image_data, decrypted)
+        self.assertEqual(FAKE_PNG, decrypted)
 
 
 class TestChannelCrypto(unittest.TestCase):
@@ -272,15 +260,9 @@ class TestEndToEnd(unittest.TestCase):
 
 def run_tests():
     """Run all tests"""
-    # Create test suite
+    # Collect every TestCase class defined in this module
     loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
-    
-    # Add all test cases
-    suite.addTests(loader.loadTestsFromTestCase(TestCryptoLayer))
-    suite.addTests(loader.loadTestsFromTestCase(TestChannelCrypto))
-    suite.addTests(loader.loadTestsFromTestCase(TestProtocol))
-    suite.addTests(loader.loadTestsFromTestCase(TestEndToEnd))
+    suite = loader.loadTestsFromModule(sys.modules[__name__])
     
     # Run tests
     runner = unittest.TextTestRunner(verbosity=2)
@@ -291,6 +273,5 @@ def run_tests():
 
 
 if __name__ == '__main__':
-    import sys
     success = run_tests()
     sys.exit(0 if success else 1)
@@ -7,32 +7,82 @@ Runs all test suites and generates coverage report
 import unittest
 import sys
 import os
+import io
+import fnmatch
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(TESTS_DIR)
+TEST_PATTERN = 'test_*.py'
 
-def run_all_tests():
-    """Discover and run all tests"""
-    # Discover all tests in the tests directory
-    loader = unittest.TestLoader()
-    start_dir = os.path.dirname(os.path.abspath(__file__))
-    suite = loader.discover(start_dir, pattern='test_*.py')
-    
-    # Run tests with verbose output
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
+
+def run_module(module_name, verbosity=0):
+    """Run one test module (in a worker process) and return its output and counts"""
+    if TESTS_DIR not in sys.path:
+        sys.path.insert(0, TESTS_DIR)
+    stream = io.StringIO()
+    suite = unittest.defaultTestLoader.loadTestsFromName(module_name)
+    result = unittest.TextTestRunner(stream=stream, verbosity=verbosity).run(suite)
+    return (
+        stream.getvalue(),
+        result.testsRun,
+        len(result.failures),
+        len(result.errors),
+        len(result.skipped),
+        result.wasSuccessful()
+    )
+
+
+def run_parallel(jobs, verbosity=0):
+    """Run each test module in its own worker process"""
+    modules = sorted(
+        name[:-3] for name in os.listdir(TESTS_DIR)
+        if fnmatch.fnmatch(name, TEST_PATTERN)
+    )
+    totals = [0, 0, 0, 0]
+    success = True
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for output, *counts, ok in executor.map(run_module, modules, repeat(verbosity)):
+            # Quiet runs only show the output of modules that failed
+            if verbosity or not ok:
+                sys.stderr.write(output)
+            totals = [total + count for total, count in zip(totals, counts)]
+            success = success and ok
+    return (*totals, success)
+
+
+def run_all_tests(jobs=1, verbosity=0):
+    """Discover and run all tests, spread over `jobs` processes if more than one"""
+    if jobs > 1:
+        tests_run, failures, errors, skipped, success = run_parallel(jobs, verbosity)
+    else:
+        # Discover all tests in the tests directory
+        loader = unittest.TestLoader()
+        suite = loader.discover(TESTS_DIR, pattern=TEST_PATTERN)
+        
+        # Per-test lines only with -v; failures are reported either way
+        runner = unittest.TextTestRunner(verbosity=verbosity)
+        result = runner.run(suite)
+        tests_run = result.testsRun
+        failures = len(result.failures)
+        errors = len(result.errors)
+        skipped = len(result.skipped)
+        success = result.wasSuccessful()
     
     # Print summary
     print("\n" + "="*70)
     print("TEST SUMMARY")
     print("="*70)
-    print(f"Tests run: {result.testsRun}")
-    print(f"Failures: {len(result.failures)}")
-    print(f"Errors: {len(result.errors)}")
-    print(f"Skipped: {len(result.skipped)}")
+    print(f"Tests run: {tests_run}")
+    print(f"Failures: {failures}")
+    print(f"Errors: {errors}")
+    print(f"Skipped: {skipped}")
     
-    if result.wasSuccessful():
+    if success:
         print("\n✓ ALL TESTS PASSED!")
         return 0
     else:
@@ -40,17 +90,34 @@ def run_all_tests():
         return 1
 
 
-def run_with_coverage():
+def run_with_coverage(verbosity=0):
     """Run tests with coverage report"""
     try:
         import coverage
         
-        # Start coverage
-        cov = coverage.Coverage(source=['..'])
+        # The pure-Python tracer is several times slower than the C one
+        try:
+            from coverage.tracer import CTracer  # noqa: F401
+        except ImportError:
+            print("coverage C tracer not available; the coverage run will be slow")
+        
+        # Start coverage (line coverage only; branch tracing adds per-arc work)
+        cov = coverage.Coverage(
+            source=[PROJECT_DIR],
+            branch=False,
+            concurrency=['thread'],
+            config_file=os.path.join(PROJECT_DIR, 'pyproject.toml')
+        )
+        # coverage resolves relative omit patterns against the working
+        # directory, so anchor the configured ones to the project root
+        cov.set_option('run:omit', [
+            pattern if pattern.startswith('*') else os.path.join(PROJECT_DIR, pattern)
+            for pattern in cov.get_option('run:omit')
+        ])
         cov.start()
         
         # Run tests
-        exit_code = run_all_tests()
+        exit_code = run_all_tests(verbosity=verbosity)
         
         # Stop coverage and report
         cov.stop()
@@ -70,12 +137,25 @@ def run_with_coverage():
     except ImportError:
         print("Coverage.py not installed. Running tests without coverage.")
         print("Install with: pip install coverage")
-        return run_all_tests()
+        return run_all_tests(verbosity=verbosity)
+
+
+def parse_jobs(argv):
+    """Worker count from --jobs N (or -j N); bare --jobs means one per CPU"""
+    for flag in ('--jobs', '-j'):
+        if flag in argv:
+            index = argv.index(flag)
+            if index + 1 < len(argv) and argv[index + 1].isdigit():
+                return max(1, int(argv[index + 1]))
+            return os.cpu_count() or 1
+    return 1
 
 
 if __name__ == '__main__':
-    # Check if --coverage flag is passed
+    verbosity = 2 if '-v' in sys.argv or '--verbose' in sys.argv else 0
+    
+    # Check if --coverage flag is passed (coverage always runs in one process)
     if '--coverage' in sys.argv:
-        sys.exit(run_with_coverage())
+        sys.exit(run_with_coverage(verbosity))
     else:
-        sys.exit(run_all_tests())
+        sys.exit(run_all_tests(parse_jobs(sys.argv), verbosity))
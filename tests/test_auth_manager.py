@@ -11,7 +11,11 @@ import time
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from auth_manager import AuthenticationManager
+from auth_manager import AuthenticationManager, PBKDF2_ITERATIONS
+
+
+# Cheap KDF for tests that only exercise account bookkeeping
+TEST_KDF_ITERATIONS = 1000
 
 
 class TestAuthenticationManager(unittest.TestCase):
@@ -25,7 +29,8 @@ class TestAuthenticationManager(unittest.TestCase):
         self.auth = AuthenticationManager(
             accounts_file=self.accounts_file,
             enable_accounts=True,
-            require_authentication=False
+            require_authentication=False,
+            kdf_iterations=TEST_KDF_ITERATIONS
         )
     
     def tearDown(self):
@@ -105,9 +110,11 @@ class TestAuthenticationManager(unittest.TestCase):
         """Test account lockout after failed attempts"""
         self.auth.create_account('testuser', 'password123')
         
-        # Make 5 failed attempts
-        for _ in range(5):
-            self.auth.authenticate('testuser', 'wrongpassword')
+        # Make 5 failed attempts; the account locks on the fifth
+        for attempt in range(1, 6):
+            with self.subTest(attempt=attempt):
+                self.assertIsNone(self.auth.authenticate('testuser', 'wrongpassword'))
+                self.assertEqual(self.auth.is_account_locked('testuser'), attempt >= 5)
         
         # Account should be locked
         self.assertTrue(self.auth.is_account_locked('testuser'))
@@ -140,10 +147,23 @@ class TestAuthenticationManager(unittest.TestCase):
             enable_accounts=True
         )
         
-        # Account should exist
+        # Account should exist, and verify with the rounds it was hashed with
         self.assertTrue(auth2.account_exists('testuser'))
         self.assertTrue(auth2.verify_password('testuser', 'password123'))
     
+    def test_default_kdf_iterations(self):
+        """Test that accounts without a recorded count use the default rounds"""
+        auth = AuthenticationManager(accounts_file=self.accounts_file)
+        self.assertEqual(auth.kdf_iterations, PBKDF2_ITERATIONS)
+        
+        hashed, salt = auth.hash_password('password123')
+        self.auth.accounts['legacy'] = {
+            'username': 'legacy',
+            'password_hash': hashed.hex(),
+            'salt': salt.hex()
+        }
+        self.assertTrue(self.auth.verify_password('legacy', 'password123'))
+    
     def test_get_account_info(self):
         """Test getting account info"""
         self.auth.create_account('testuser', 'password123', 'test@example.com')
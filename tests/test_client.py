@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Tests for client.py
+Tests inbound dispatch and outbound send paths of the CLI client
+"""
+
+import unittest
+import asyncio
+import json
+import logging
+import os
+import socket
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from client import IRCClient, LogRateLimitFilter, message_prefix, READ_BUFFER_LIMIT, WRITE_BUFFER_HIGH, \
+    OFFLOAD_DECRYPT_SIZE, DISPATCH_WORKERS, DISPATCH_QUEUE_SIZE
+from protocol import MessageType
+from crypto_layer import CryptoLayer
+
+
+def make_reader(messages):
+    """Build a StreamReader pre-loaded with newline-delimited JSON frames"""
+    reader = asyncio.StreamReader()
+    for message in messages:
+        reader.feed_data(json.dumps(message).encode('utf-8') + b'\n')
+    reader.feed_eof()
+    return reader
+
+
+class TestReceiveDispatch(unittest.IsolatedAsyncioTestCase):
+    """Test dispatch of inbound messages through the worker pool"""
+
+    async def asyncSetUp(self):
+        """Set up a client with a recording message handler"""
+        self.client = IRCClient('localhost', 6667, 'alice')
+        self.client.running = True
+        self.handled = []
+
+        async def record(message):
+            self.handled.append(message['seq'])
+
+        self.client.handle_message = record
+
+    def chat(self, seq, from_id='bob'):
+        """Build a sender-scoped frame"""
+        return {'type': MessageType.PRIVATE_MESSAGE.value, 'from_id': from_id, 'seq': seq}
+
+    def control(self, seq):
+        """Build a state-changing frame"""
+        return {'type': MessageType.USER_LIST.value, 'seq': seq}
+
+    async def test_messages_dispatched_in_order(self):
+        """Test frames from one sender reach the handler in arrival order"""
+        self.client.reader = make_reader([self.chat(i) for i in range(10)])
+
+        await self.client.receive_loop()
+
+        self.assertEqual(self.handled, list(range(10)))
+        self.assertEqual(self.client._dispatch_workers, [])
+
+    async def test_control_messages_wait_for_workers(self):
+        """Test state changes apply after earlier frames and before later ones"""
+        frames = [self.chat(0, 'bob'), self.chat(1, 'carol'), self.control(2),
+                  self.chat(3, 'bob'), self.chat(4, 'dave')]
+        self.client.reader = make_reader(frames)
+
+        await self.client.receive_loop()
+
+        self.assertEqual(sorted(self.handled[:2]), [0, 1])
+        self.assertEqual(self.handled[2], 2)
+        self.assertEqual(sorted(self.handled[3:]), [3, 4])
+
+    async def test_slow_sender_does_not_block_others(self):
+        """Test a stalled handler only holds up its own sender"""
+        release = asyncio.Event()
+        senders = ['bob', 'carol']
+        while hash(senders[0]) % DISPATCH_WORKERS == hash(senders[1]) % DISPATCH_WORKERS:
+            senders[1] += '_'
+
+        async def handler(message):
+            if message['from_id'] == senders[0]:
+                await release.wait()
+            self.handled.append(message['seq'])
+
+        self.client.handle_message = handler
+        reader = asyncio.StreamReader()
+        reader.feed_data(json.dumps(self.chat(0, senders[0])).encode('utf-8') + b'\n')
+        reader.feed_data(json.dumps(self.chat(1, senders[1])).encode('utf-8') + b'\n')
+        self.client.reader = reader
+
+        loop_task = asyncio.create_task(self.client.receive_loop())
+        for _ in range(5):
+            await asyncio.sleep(0)
+        self.assertEqual(self.handled, [1])
+
+        release.set()
+        reader.feed_eof()
+        await loop_task
+        self.assertEqual(self.handled, [1, 0])
+
+    async def test_rekey_request_waits_for_workers(self):
+        """Test a rekey request runs only after frames queued before it"""
+        release = asyncio.Event()
+        senders = ['bob', 'carol']
+        while hash(senders[0]) % DISPATCH_WORKERS == hash(senders[1]) % DISPATCH_WORKERS:
+            senders[1] += '_'
+
+        async def handler(message):
+            if message['from_id'] == senders[0]:
+                await release.wait()
+            self.handled.append(message['seq'])
+
+        self.client.handle_message = handler
+        rekey = {'type': MessageType.REKEY_REQUEST.value, 'from_id': senders[1], 'seq': 1}
+        reader = asyncio.StreamReader()
+        reader.feed_data(json.dumps(self.chat(0, senders[0])).encode('utf-8') + b'\n')
+        reader.feed_data(json.dumps(rekey).encode('utf-8') + b'\n')
+        self.client.reader = reader
+
+        loop_task = asyncio.create_task(self.client.receive_loop())
+        for _ in range(5):
+            await asyncio.sleep(0)
+        self.assertEqual(self.handled, [])
+
+        release.set()
+        reader.feed_eof()
+        await loop_task
+        self.assertEqual(self.handled, [0, 1])
+
+    async def test_backlog_larger_than_queue(self):
+        """Test a backlog beyond the queue size is fully delivered"""
+        count = DISPATCH_QUEUE_SIZE * 3
+        self.client.reader = make_reader([self.chat(i) for i in range(count)])
+
+        await self.client.receive_loop()
+
+        self.assertEqual(self.handled, list(range(count)))
+
+    async def test_handler_error_does_not_stop_dispatch(self):
+        """Test a failing handler does not drop later frames"""
+        async def flaky(message):
+            if message['seq'] == 1:
+                raise RuntimeError("boom")
+            self.handled.append(message['seq'])
+
+        self.client.handle_message = flaky
+        self.client.reader = make_reader([self.chat(i) for i in range(3)])
+
+        with self.assertLogs('JustIRC-Client', 'WARNING') as logs:
+            await self.client.receive_loop()
+
+        self.assertEqual(self.handled, [0, 2])
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("Error handling message: boom", logs.output[0])
+
+    async def test_invalid_json_skipped(self):
+        """Test malformed frames are skipped"""
+        reader = asyncio.StreamReader()
+        reader.feed_data(b'not json\n')
+        reader.feed_data(json.dumps(self.control(7)).encode('utf-8') + b'\n')
+        reader.feed_eof()
+        self.client.reader = reader
+
+        with self.assertLogs('JustIRC-Client', 'WARNING') as logs:
+            await self.client.receive_loop()
+
+        self.assertEqual(self.handled, [7])
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("Invalid JSON: b'not json", logs.output[0])
+
+
+class TestMessageHandling(unittest.IsolatedAsyncioTestCase):
+    """Test handling of individual inbound message types"""
+
+    async def asyncSetUp(self):
+        """Set up a client that has joined a channel"""
+        self.client = IRCClient('localhost', 6667, 'alice')
+        self.client.print_error = lambda text: None
+        self.client.joined_channels.add('#test')
+        self.client.current_channel = '#test'
+
+    async def test_kick_leaves_channel(self):
+        """Test a kick removes the channel and clears the current channel"""
+        await self.client.handle_message({
+            'type': MessageType.KICK_USER.value, 'channel': '#test', 'kicked_by': 'bob'
+        })
+
+        self.assertNotIn('#test', self.client.joined_channels)
+        self.assertIsNone(self.client.current_channel)
+
+    async def test_ack_sets_user_id(self):
+        """Test a registration ack records our user id"""
+        self.client.print_success = lambda text: None
+        await self.client.handle_message({'type': MessageType.ACK.value, 'user_id': 'u1'})
+
+        self.assertEqual(self.client.user_id, 'u1')
+
+    async def test_image_chunk_queued_until_decided(self):
+        """Test chunks queue while undecided and are dropped once declined"""
+        self.client.pending_images['img1'] = {'accepted': None, 'queued_chunks': {}}
+        chunk = {'type': MessageType.IMAGE_CHUNK.value, 'from_id': 'bob', 'image_id': 'img1',
+                 'chunk_number': 0, 'encrypted_data': 'data', 'nonce': 'nonce'}
+
+        await self.client.handle_message(chunk)
+        self.assertEqual(self.client.pending_images['img1']['queued_chunks'],
+                         {0: ('data', 'nonce')})
+
+        self.client.decline_image_transfer('img1')
+        await self.client.handle_message(dict(chunk, chunk_number=1))
+        self.assertEqual(self.client.pending_images['img1']['queued_chunks'], {})
+
+    async def test_unknown_image_chunk_ignored(self):
+        """Test chunks for unknown transfers are ignored without reading them"""
+        await self.client.handle_message(
+            {'type': MessageType.IMAGE_CHUNK.value, 'from_id': 'bob', 'image_id': 'nope'}
+        )
+
+        self.assertEqual(self.client.pending_images, {})
+
+    async def test_unknown_type_ignored(self):
+        """Test unknown and missing message types are ignored"""
+        await self.client.handle_message({'type': 'no_such_type'})
+        await self.client.handle_message({})
+
+        self.assertIn('#test', self.client.joined_channels)
+
+
+class TestDecryptOffload(unittest.IsolatedAsyncioTestCase):
+    """Test inline and thread-pool decryption of inbound messages"""
+
+    async def asyncSetUp(self):
+        """Set up a client with a keyed peer"""
+        self.client = IRCClient('localhost', 6667, 'alice')
+        self.peer = CryptoLayer()
+        self.client.crypto.load_peer_public_key('bob', self.peer.get_public_key_b64())
+        self.peer.load_peer_public_key('alice', self.client.crypto.get_public_key_b64())
+        self.printed = []
+        self.client.print_message = lambda sender, text, **kwargs: self.printed.append(text)
+
+    async def asyncTearDown(self):
+        """Release the crypto thread pool"""
+        if self.client._crypto_executor:
+            self.client._crypto_executor.shutdown()
+
+    async def receive(self, text):
+        """Deliver a private message from the peer"""
+        encrypted_data, nonce = self.peer.encrypt('alice', text)
+        await self.client.handle_private_message(
+            {'from_id': 'bob', 'encrypted_data': encrypted_data, 'nonce': nonce}
+        )
+
+    async def test_small_message_decrypted_inline(self):
+        """Test short messages skip the thread pool"""
+        await self.receive("hello")
+
+        self.assertEqual(self.printed, ["hello"])
+        self.assertIsNone(self.client._crypto_executor)
+
+    async def test_large_message_decrypted_on_pool(self):
+        """Test long messages are decrypted on the thread pool"""
+        text = "x" * OFFLOAD_DECRYPT_SIZE
+        await self.receive(text)
+
+        self.assertEqual(self.printed, [text])
+        self.assertIsNotNone(self.client._crypto_executor)
+
+
+class TestMessagePrefix(unittest.TestCase):
+    """Test cached chat line prefixes"""
+
+    def test_prefix_contents(self):
+        """Test prefixes name the sender and channel"""
+        self.assertIn("[PM from bob]", message_prefix("bob", True, None))
+        self.assertIn("[#test] bob:", message_prefix("bob", False, "#test"))
+        self.assertIn("bob:", message_prefix("bob"))
+
+    def test_prefix_cached(self):
+        """Test repeated senders reuse the same prefix"""
+        self.assertIs(message_prefix("carol", False, "#test"),
+                      message_prefix("carol", False, "#test"))
+
+
+class TestConnection(unittest.IsolatedAsyncioTestCase):
+    """Test connection setup against a local server"""
+
+    async def asyncSetUp(self):
+        """Start a server that records the first frame it receives"""
+        self.received = asyncio.get_running_loop().create_future()
+
+        async def on_client(reader, writer):
+            self.received.set_result(await reader.readline())
+            writer.close()
+
+        self.server = await asyncio.start_server(on_client, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        """Stop the server"""
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def test_connection_is_tuned(self):
+        """Test socket options and buffer limits are applied on connect"""
+        client = IRCClient('127.0.0.1', self.port, 'alice')
+
+        self.assertTrue(await client.connect())
+        sock = client.writer.get_extra_info('socket')
+
+        self.assertTrue(sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY))
+        self.assertTrue(sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE))
+        self.assertEqual(client.reader._limit, READ_BUFFER_LIMIT)
+        self.assertEqual(client.writer.transport.get_write_buffer_limits()[1], WRITE_BUFFER_HIGH)
+
+        frame = json.loads(await self.received)
+        self.assertEqual(frame['type'], MessageType.REGISTER.value)
+
+        client.writer.close()
+        await client.writer.wait_closed()
+
+
+class TestOutboundSend(unittest.TestCase):
+    """Test outbound message encoding"""
+
+    def test_from_id_field_follows_user_id(self):
+        """Test the cached from_id field is rebuilt when user_id changes"""
+        client = IRCClient('localhost', 6667, 'alice')
+        client.user_id = 'user-1'
+        first = client.get_from_id_field()
+
+        self.assertIs(client.get_from_id_field(), first)
+        self.assertEqual(json.loads(b'{' + first + b'}'), {'from_id': 'user-1'})
+
+        client.user_id = 'user-2'
+        self.assertEqual(json.loads(b'{' + client.get_from_id_field() + b'}'),
+                         {'from_id': 'user-2'})
+
+
+class TestUserIndex(unittest.TestCase):
+    """Test nickname lookup used by the send paths"""
+
+    def setUp(self):
+        """Set up a client"""
+        self.client = IRCClient('localhost', 6667, 'alice')
+
+    def test_lookup_by_nickname(self):
+        """Test users are found by nickname"""
+        self.client.set_user('u1', 'bob', 'key1')
+        self.client.set_user('u2', 'carol', 'key2')
+
+        self.assertEqual(self.client.user_ids.get('bob'), 'u1')
+        self.assertEqual(self.client.user_ids.get('carol'), 'u2')
+        self.assertEqual(self.client.users['u1'], {'nickname': 'bob', 'public_key': 'key1'})
+
+    def test_nickname_change_drops_old_entry(self):
+        """Test a renamed user is no longer found by the old nickname"""
+        self.client.set_user('u1', 'bob', 'key1')
+        self.client.set_user('u1', 'robert', 'key1')
+
+        self.assertNotIn('bob', self.client.user_ids)
+        self.assertEqual(self.client.user_ids['robert'], 'u1')
+
+
+class TestLogRateLimitFilter(unittest.TestCase):
+    """Test rate limiting of repeated log messages"""
+
+    def make_record(self, msg, *args):
+        """Build a log record"""
+        return logging.LogRecord('test', logging.WARNING, __file__, 0, msg, args, None)
+
+    def test_repeats_dropped_past_budget(self):
+        """Test a message is dropped once its budget is spent"""
+        log_filter = LogRateLimitFilter(max_per_second=3)
+        allowed = [
+            log_filter.filter(self.make_record("Failed to decrypt: %s", i)) for i in range(10)
+        ]
+
+        self.assertEqual(allowed, [True] * 3 + [False] * 7)
+
+    def test_distinct_messages_have_separate_budgets(self):
+        """Test one noisy message does not silence others"""
+        log_filter = LogRateLimitFilter(max_per_second=1)
+
+        self.assertTrue(log_filter.filter(self.make_record("Failed to decrypt: %s", 1)))
+        self.assertFalse(log_filter.filter(self.make_record("Failed to decrypt: %s", 2)))
+        self.assertTrue(log_filter.filter(self.make_record("Invalid JSON: %s", "x")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,21 +12,27 @@ import json
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config_manager import ConfigManager
+from config_manager import ConfigManager, NICK_COLORS
 
 
 class TestConfigManager(unittest.TestCase):
     """Test configuration management"""
     
-    def setUp(self):
-        """Set up test environment"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.config_file = os.path.join(self.temp_dir, "test_config.json")
+    @classmethod
+    def setUpClass(cls):
+        """Create one temporary directory for the whole class"""
+        cls.temp_dir = tempfile.mkdtemp()
     
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """Clean up"""
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
+        if os.path.exists(cls.temp_dir):
+            shutil.rmtree(cls.temp_dir)
+    
+    def setUp(self):
+        """Set up test environment"""
+        # Each test gets its own config file inside the shared directory
+        self.config_file = os.path.join(self.temp_dir, f"{self._testMethodName}.json")
     
     def test_config_creation(self):
         """Test config file creation"""
@@ -77,6 +83,45 @@ class TestConfigManager(unittest.TestCase):
         config.set('key', value='value2')
         self.assertEqual(config.get('key'), 'value2')
 
+    def test_get_section(self):
+        """Test fetching a whole config section"""
+        config = ConfigManager(self.config_file)
+        config.set('ui', 'show_timestamps', value=False)
+        
+        self.assertFalse(config.get_section('ui')['show_timestamps'])
+        self.assertEqual(config.get_section('nonexistent'), {})
+        self.assertEqual(config.get_section('theme'), {})
+        
+        # Changes to the returned dict must go through set()
+        config.get_section('ui')['show_timestamps'] = True
+        self.assertFalse(config.get('ui', 'show_timestamps'))
+    
+    def test_batch_saves_once(self):
+        """Test batch() defers saving until the block exits"""
+        config = ConfigManager(self.config_file)
+        saves = []
+        original_save = config.save_config
+        config.save_config = lambda: (saves.append(1), original_save())
+        
+        with config.batch():
+            config.set('server', 'last_server', value='localhost')
+            with config.batch():
+                config.set('server', 'last_port', value='6667')
+            self.assertEqual(saves, [])
+        
+        self.assertEqual(len(saves), 1)
+        config2 = ConfigManager(self.config_file)
+        self.assertEqual(config2.get('server', 'last_server'), 'localhost')
+        self.assertEqual(config2.get('server', 'last_port'), '6667')
+    
+    def test_nick_color_is_stable(self):
+        """Test nickname colors are consistent and from the palette"""
+        config = ConfigManager(self.config_file)
+
+        color = config.get_nick_color('alice')
+        self.assertIn(color, NICK_COLORS)
+        self.assertEqual(ConfigManager(self.config_file).get_nick_color('alice'), color)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -15,6 +15,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from crypto_layer import CryptoLayer, ChannelCrypto
 
 
+# bytes.translate table that flips the low bit of every byte
+FLIP_LOW_BIT = bytes(b ^ 1 for b in range(256))
+
+
 class TestCryptoLayer(unittest.TestCase):
     """Test cryptographic functions"""
     
@@ -22,7 +26,6 @@ class TestCryptoLayer(unittest.TestCase):
         """Set up test fixtures"""
         self.alice = CryptoLayer()
         self.bob = CryptoLayer()
-        self.charlie = CryptoLayer()
     
     def test_key_generation(self):
         """Test that keys are generated correctly"""
@@ -51,18 +54,28 @@ class TestCryptoLayer(unittest.TestCase):
         self.assertTrue(self.alice.has_peer_key("bob"))
         self.assertTrue(self.bob.has_peer_key("alice"))
     
+    def test_key_exchange_bytes(self):
+        """Test key exchange from raw public key bytes"""
+        self.alice.load_peer_public_key_bytes("bob", self.bob.get_public_key_bytes())
+        self.bob.load_peer_public_key_bytes("alice", self.alice.get_public_key_bytes())
+        
+        self.assertTrue(self.alice.has_peer_key("bob"))
+        self.assertTrue(self.bob.has_peer_key("alice"))
+    
     def test_invalid_public_key(self):
         """Test that invalid public key raises error"""
         with self.assertRaises(ValueError):
             self.alice.load_peer_public_key("invalid", "not_a_valid_key")
     
+    def test_invalid_public_key_bytes(self):
+        """Test that public key bytes of the wrong length raise error"""
+        with self.assertRaises(ValueError):
+            self.alice.load_peer_public_key_bytes("invalid", b"\x00" * 31)
+    
     def test_encryption_decryption(self):
         """Test message encryption and decryption"""
-        alice_pub = self.alice.get_public_key_b64()
-        bob_pub = self.bob.get_public_key_b64()
-        
-        self.alice.load_peer_public_key("bob", bob_pub)
-        self.bob.load_peer_public_key("alice", alice_pub)
+        self.alice.load_peer_public_key_bytes("bob", self.bob.get_public_key_bytes())
+        self.bob.load_peer_public_key_bytes("alice", self.alice.get_public_key_bytes())
         
         plaintext = "Hello Bob, this is a secret message!"
         encrypted, nonce = self.alice.encrypt("bob", plaintext)
@@ -72,11 +85,8 @@ class TestCryptoLayer(unittest.TestCase):
     
     def test_encryption_empty_message(self):
         """Test encryption of empty message"""
-        alice_pub = self.alice.get_public_key_b64()
-        bob_pub = self.bob.get_public_key_b64()
-        
-        self.alice.load_peer_public_key("bob", bob_pub)
-        self.bob.load_peer_public_key("alice", alice_pub)
+        self.alice.load_peer_public_key_bytes("bob", self.bob.get_public_key_bytes())
+        self.bob.load_peer_public_key_bytes("alice", self.alice.get_public_key_bytes())
         
         plaintext = ""
         encrypted, nonce = self.alice.encrypt("bob", plaintext)
@@ -86,11 +96,8 @@ class TestCryptoLayer(unittest.TestCase):
     
     def test_encryption_unicode(self):
         """Test encryption with unicode characters"""
-        alice_pub = self.alice.get_public_key_b64()
-        bob_pub = self.bob.get_public_key_b64()
-        
-        self.alice.load_peer_public_key("bob", bob_pub)
-        self.bob.load_peer_public_key("alice", alice_pub)
+        self.alice.load_peer_public_key_bytes("bob", self.bob.get_public_key_bytes())
+        self.bob.load_peer_public_key_bytes("alice", self.alice.get_public_key_bytes())
         
         plaintext = "Hello 🌍! Testing 日本語 and العربية"
         encrypted, nonce = self.alice.encrypt("bob", plaintext)
@@ -100,11 +107,8 @@ class TestCryptoLayer(unittest.TestCase):
     
     def test_encryption_large_message(self):
         """Test encryption of large message"""
-        alice_pub = self.alice.get_public_key_b64()
-        bob_pub = self.bob.get_public_key_b64()
-        
-        self.alice.load_peer_public_key("bob", bob_pub)
-        self.bob.load_peer_public_key("alice", alice_pub)
+        self.alice.load_peer_public_key_bytes("bob", self.bob.get_public_key_bytes())
+        self.bob.load_peer_public_key_bytes("alice", self.alice.get_public_key_bytes())
         
         plaintext = "A" * 10000  # 10KB message
         encrypted, nonce = self.alice.encrypt("bob", plaintext)
@@ -114,12 +118,11 @@ class TestCryptoLayer(unittest.TestCase):
     
     def test_encryption_different_peers(self):
         """Test that encryption is different for different peers"""
-        alice_pub = self.alice.get_public_key_b64()
-        bob_pub = self.bob.get_public_key_b64()
-        charlie_pub = self.charlie.get_public_key_b64()
+        # Only this test needs a third party, so it gets its own key pair
+        charlie = CryptoLayer()
         
-        self.alice.load_peer_public_key("bob", bob_pub)
-        self.alice.load_peer_public_key("charlie", charlie_pub)
+        self.alice.load_peer_public_key_bytes("bob", self.bob.get_public_key_bytes())
+        self.alice.load_peer_public_key_bytes("charlie", charlie.get_public_key_bytes())
         
         plaintext = "Same message to both"
         encrypted_bob, nonce_bob = self.alice.encrypt("bob", plaintext)
@@ -129,18 +132,15 @@ class TestCryptoLayer(unittest.TestCase):
     
     def test_tampering_detection(self):
         """Test that tampering is detected"""
-        alice_pub = self.alice.get_public_key_b64()
-        bob_pub = self.bob.get_public_key_b64()
-        
-        self.alice.load_peer_public_key("bob", bob_pub)
-        self.bob.load_peer_public_key("alice", alice_pub)
+        self.alice.load_peer_public_key_bytes("bob", self.bob.get_public_key_bytes())
+        self.bob.load_peer_public_key_bytes("alice", self.alice.get_public_key_bytes())
         
         plaintext = "Important message"
         encrypted, nonce = self.alice.encrypt("bob", plaintext)
         
         # Tamper with the ciphertext
         encrypted_bytes = base64.b64decode(encrypted)
-        tampered_bytes = bytes([b ^ 1 for b in encrypted_bytes])
+        tampered_bytes = encrypted_bytes.translate(FLIP_LOW_BIT)
         tampered_encrypted = base64.b64encode(tampered_bytes).decode('utf-8')
         
         with self.assertRaises(ValueError):
@@ -148,11 +148,8 @@ class TestCryptoLayer(unittest.TestCase):
     
     def test_wrong_nonce(self):
         """Test that wrong nonce fails decryption"""
-        alice_pub = self.alice.get_public_key_b64()
-        bob_pub = self.bob.get_public_key_b64()
-        
-        self.alice.load_peer_public_key("bob", bob_pub)
-        self.bob.load_peer_public_key("alice", alice_pub)
+        self.alice.load_peer_public_key_bytes("bob", self.bob.get_public_key_bytes())
+        self.bob.load_peer_public_key_bytes("alice", self.alice.get_public_key_bytes())
         
         plaintext = "Test message"
         encrypted, _ = self.alice.encrypt("bob", plaintext)
@@ -173,11 +170,8 @@ class TestCryptoLayer(unittest.TestCase):
     
     def test_image_encryption(self):
         """Test image encryption and decryption"""
-        alice_pub = self.alice.get_public_key_b64()
-        bob_pub = self.bob.get_public_key_b64()
-        
-        self.alice.load_peer_public_key("bob", bob_pub)
-        self.bob.load_peer_public_key("alice", alice_pub)
+        self.alice.load_peer_public_key_bytes("bob", self.bob.get_public_key_bytes())
+        self.bob.load_peer_public_key_bytes("alice", self.alice.get_public_key_bytes())
         
         # Simulate image data
         image_data = b'\x89PNG\r\n\x1a\n' + os.urandom(1000)
@@ -187,26 +181,23 @@ class TestCryptoLayer(unittest.TestCase):
         
         self.assertEqual(image_data, decrypted)
     
-    def test_image_encryption_large(self):
-        """Test encryption of large image (1MB)"""
-        alice_pub = self.alice.get_public_key_b64()
-        bob_pub = self.bob.get_public_key_b64()
-        
-        self.alice.load_peer_public_key("bob", bob_pub)
-        self.bob.load_peer_public_key("alice", alice_pub)
-        
-        image_data = os.urandom(1024 * 1024)  # 1MB
-        encrypted, nonce = self.alice.encrypt_image("bob", image_data)
-        decrypted = self.bob.decrypt_image("alice", encrypted, nonce)
-        
-        self.assertEqual(image_data, decrypted)
+    def test_image_encryption_sizes(self):
+        """Test image encryption from empty up to a large image (1MB)"""
+        self.alice.load_peer_public_key_bytes("bob", self.bob.get_public_key_bytes())
+        self.bob.load_peer_public_key_bytes("alice", self.alice.get_public_key_bytes())
+        
+        random_data = os.urandom(1024 * 1024)
+        for size in (0, 1, 1000, 10000, 1024 * 1024):
+            with self.subTest(size=size):
+                image_data = random_data[:size]
+                encrypted, nonce = self.alice.encrypt_image("bob", image_data)
+                decrypted = self.bob.decrypt_image("alice", encrypted, nonce)
+                
+                self.assertEqual(image_data, decrypted)
     
     def test_nonce_uniqueness(self):
         """Test that nonces are unique for each encryption"""
-        alice_pub = self.alice.get_public_key_b64()
-        bob_pub = self.bob.get_public_key_b64()
-        
-        self.alice.load_peer_public_key("bob", bob_pub)
+        self.alice.load_peer_public_key_bytes("bob", self.bob.get_public_key_bytes())
         
         nonces = set()
         for _ in range(100):
@@ -321,7 +312,7 @@ class TestChannelCrypto(unittest.TestCase):
         
         # Tamper with the ciphertext
         encrypted_bytes = base64.b64decode(encrypted)
-        tampered_bytes = bytes([b ^ 1 for b in encrypted_bytes])
+        tampered_bytes = encrypted_bytes.translate(FLIP_LOW_BIT)
         tampered_encrypted = base64.b64encode(tampered_bytes).decode('utf-8')
         
         with self.assertRaises(ValueError):
@@ -14,23 +14,26 @@ from crypto_layer import CryptoLayer
 from image_transfer import ImageTransfer
 
 
+# Incompressible test payloads are slices of one buffer, read from the OS once
+RANDOM_DATA = os.urandom(1024 * 1024)
+
+
 class TestImageTransfer(unittest.TestCase):
     """Test image transfer functionality"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.alice_crypto = CryptoLayer()
-        self.bob_crypto = CryptoLayer()
+    @classmethod
+    def setUpClass(cls):
+        """Generate and exchange keys once; the tests only encrypt with them"""
+        cls.alice_crypto = CryptoLayer()
+        cls.bob_crypto = CryptoLayer()
         
         # Exchange keys
-        alice_pub = self.alice_crypto.get_public_key_b64()
-        bob_pub = self.bob_crypto.get_public_key_b64()
-        
-        self.alice_crypto.load_peer_public_key("bob", bob_pub)
-        self.bob_crypto.load_peer_public_key("alice", alice_pub)
-        
+        cls.alice_crypto.load_peer_public_key_bytes("bob", cls.bob_crypto.get_public_key_bytes())
+        cls.bob_crypto.load_peer_public_key_bytes("alice", cls.alice_crypto.get_public_key_bytes())
+    
+    def setUp(self):
+        """Set up test fixtures"""
         self.alice_transfer = ImageTransfer(self.alice_crypto)
-        self.bob_transfer = ImageTransfer(self.bob_crypto)
     
     def test_image_chunking_small(self):
         """Test chunking of small image"""
@@ -45,7 +48,7 @@ class TestImageTransfer(unittest.TestCase):
     
     def test_image_chunking_large(self):
         """Test chunking of large image (1MB)"""
-        image_data = os.urandom(1024 * 1024)
+        image_data = RANDOM_DATA
         chunks = self.alice_transfer.chunk_image(image_data)
         
         self.assertGreater(len(chunks), 1)
@@ -56,22 +59,19 @@ class TestImageTransfer(unittest.TestCase):
     
     def test_image_encryption_decryption(self):
         """Test full image encryption and decryption"""
-        image_data = os.urandom(50000)  # 50KB image
-        
-        # Encrypt chunks
-        encrypted_chunks = []
-        nonces = []
+        image_data = RANDOM_DATA[:50000]  # 50KB image
         
-        for chunk in self.alice_transfer.chunk_image(image_data):
-            encrypted, nonce = self.alice_crypto.encrypt_image("bob", chunk)
-            encrypted_chunks.append(encrypted)
-            nonces.append(nonce)
+        # Encrypt chunks as (encrypted, nonce) pairs
+        encrypted_chunks = [
+            self.alice_crypto.encrypt_image("bob", chunk)
+            for chunk in self.alice_transfer.chunk_image(image_data)
+        ]
         
         # Decrypt chunks
-        decrypted_chunks = []
-        for encrypted, nonce in zip(encrypted_chunks, nonces):
-            decrypted = self.bob_crypto.decrypt_image("alice", encrypted, nonce)
-            decrypted_chunks.append(decrypted)
+        decrypted_chunks = [
+            self.bob_crypto.decrypt_image("alice", encrypted, nonce)
+            for encrypted, nonce in encrypted_chunks
+        ]
         
         # Reassemble
         reassembled = b''.join(decrypted_chunks)
@@ -79,7 +79,7 @@ class TestImageTransfer(unittest.TestCase):
     
     def test_chunk_size_consistency(self):
         """Test that all chunks except last are same size"""
-        image_data = os.urandom(100000)  # 100KB
+        image_data = RANDOM_DATA[:100000]  # 100KB
         chunks = self.alice_transfer.chunk_image(image_data)
         
         # All chunks except last should be same size
@@ -110,7 +110,7 @@ class TestImageTransfer(unittest.TestCase):
     def test_exact_chunk_size(self):
         """Test image that exactly matches chunk size"""
         chunk_size = self.alice_transfer.CHUNK_SIZE
-        image_data = os.urandom(chunk_size)
+        image_data = RANDOM_DATA[:chunk_size]
         chunks = self.alice_transfer.chunk_image(image_data)
         
         # Should have 1 or 2 chunks (implementation specific)
@@ -121,7 +121,7 @@ class TestImageTransfer(unittest.TestCase):
     def test_multiple_of_chunk_size(self):
         """Test image that is multiple of chunk size"""
         chunk_size = self.alice_transfer.CHUNK_SIZE
-        image_data = os.urandom(chunk_size * 3)
+        image_data = RANDOM_DATA[:chunk_size * 3]
         chunks = self.alice_transfer.chunk_image(image_data)
         
         # Should have at least 3 chunks
@@ -4,7 +4,6 @@ Tests for key rotation functionality
 """
 
 import unittest
-import time
 import os
 import sys
 
@@ -16,15 +15,15 @@ from crypto_layer import CryptoLayer
 class TestKeyRotation(unittest.TestCase):
     """Test key rotation functionality"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Generate Bob's key pair once; most tests only need his public key"""
+        cls.bob_pub = CryptoLayer().get_public_key_bytes()
+    
     def test_key_rotation_initialization(self):
         """Test that rotation tracking is initialized"""
         alice = CryptoLayer(key_rotation_interval=60.0, max_messages_per_key=100)
-        bob = CryptoLayer()
-        
-        alice_pub = alice.get_public_key_b64()
-        bob_pub = bob.get_public_key_b64()
-        
-        alice.load_peer_public_key("bob", bob_pub)
+        alice.load_peer_public_key_bytes("bob", self.bob_pub)
         
         # Should have timestamp and message count
         self.assertIn("bob", alice.peer_key_timestamp)
@@ -34,13 +33,7 @@ class TestKeyRotation(unittest.TestCase):
     def test_message_count_increments(self):
         """Test that message count increments on encryption"""
         alice = CryptoLayer()
-        bob = CryptoLayer()
-        
-        alice_pub = alice.get_public_key_b64()
-        bob_pub = bob.get_public_key_b64()
-        
-        alice.load_peer_public_key("bob", bob_pub)
-        bob.load_peer_public_key("alice", alice_pub)
+        alice.load_peer_public_key_bytes("bob", self.bob_pub)
         
         # Send messages
         for i in range(5):
@@ -51,12 +44,7 @@ class TestKeyRotation(unittest.TestCase):
     def test_should_rotate_message_limit(self):
         """Test that rotation is needed after message limit"""
         alice = CryptoLayer(max_messages_per_key=3)
-        bob = CryptoLayer()
-        
-        alice_pub = alice.get_public_key_b64()
-        bob_pub = bob.get_public_key_b64()
-        
-        alice.load_peer_public_key("bob", bob_pub)
+        alice.load_peer_public_key_bytes("bob", self.bob_pub)
         
         # Should not need rotation initially
         self.assertFalse(alice.should_rotate_key("bob"))
@@ -70,19 +58,14 @@ class TestKeyRotation(unittest.TestCase):
     
     def test_should_rotate_time_limit(self):
         """Test that rotation is needed after time limit"""
-        alice = CryptoLayer(key_rotation_interval=0.1)  # 100ms
-        bob = CryptoLayer()
-        
-        alice_pub = alice.get_public_key_b64()
-        bob_pub = bob.get_public_key_b64()
-        
-        alice.load_peer_public_key("bob", bob_pub)
+        alice = CryptoLayer(key_rotation_interval=60.0)
+        alice.load_peer_public_key_bytes("bob", self.bob_pub)
         
         # Should not need rotation initially
         self.assertFalse(alice.should_rotate_key("bob"))
         
-        # Wait for time limit
-        time.sleep(0.15)
+        # Age the key past the time limit instead of sleeping through it
+        alice.peer_key_timestamp["bob"] -= 61.0
         
         # Should need rotation now
         self.assertTrue(alice.should_rotate_key("bob"))
@@ -90,12 +73,7 @@ class TestKeyRotation(unittest.TestCase):
     def test_get_rotation_reason(self):
         """Test getting rotation reason"""
         alice = CryptoLayer(max_messages_per_key=2)
-        bob = CryptoLayer()
-        
-        alice_pub = alice.get_public_key_b64()
-        bob_pub = bob.get_public_key_b64()
-        
-        alice.load_peer_public_key("bob", bob_pub)
+        alice.load_peer_public_key_bytes("bob", self.bob_pub)
         
         # No rotation needed initially
         self.assertIsNone(alice.get_rotation_reason("bob"))
@@ -112,12 +90,7 @@ class TestKeyRotation(unittest.TestCase):
     def test_get_key_stats(self):
         """Test getting key statistics"""
         alice = CryptoLayer(max_messages_per_key=10)
-        bob = CryptoLayer()
-        
-        alice_pub = alice.get_public_key_b64()
-        bob_pub = bob.get_public_key_b64()
-        
-        alice.load_peer_public_key("bob", bob_pub)
+        alice.load_peer_public_key_bytes("bob", self.bob_pub)
         
         # Send some messages
         for i in range(3):
@@ -136,13 +109,7 @@ class TestKeyRotation(unittest.TestCase):
     def test_rotate_key_for_peer(self):
         """Test key rotation"""
         alice = CryptoLayer()
-        bob = CryptoLayer()
-        
-        alice_pub = alice.get_public_key_b64()
-        bob_pub = bob.get_public_key_b64()
-        
-        alice.load_peer_public_key("bob", bob_pub)
-        bob.load_peer_public_key("alice", alice_pub)
+        alice.load_peer_public_key_bytes("bob", self.bob_pub)
         
         # Send messages
         for i in range(5):
@@ -5,6 +5,7 @@ Tests message building and parsing
 """
 
 import unittest
+import base64
 import json
 import os
 import sys
@@ -50,6 +51,36 @@ class TestProtocol(unittest.TestCase):
         self.assertEqual(parsed['from_id'], "alice")
         self.assertEqual(parsed['to_id'], "#test")
     
+    def test_encrypted_message_bytes_matches_json(self):
+        """Test pre-encoded message builder matches encrypted_message"""
+        from_id_field = Protocol.encode_field("from_id", "alice")
+        for is_channel, to_id in ((False, "bob"), (True, "#tést \"chan\"")):
+            expected = Protocol.parse_message(Protocol.encrypted_message(
+                "alice", to_id, "encrypted_data", "nonce", is_channel=is_channel
+            ))
+            parsed = Protocol.parse_message(Protocol.encrypted_message_bytes(
+                from_id_field, to_id, "encrypted_data", "nonce", is_channel=is_channel
+            ).decode('utf-8'))
+            
+            del expected['timestamp']
+            self.assertIsInstance(parsed.pop('timestamp'), float)
+            self.assertEqual(parsed, expected)
+    
+    def test_image_chunk_bytes_matches_json(self):
+        """Test raw-ciphertext chunk builder matches image_chunk"""
+        chunk = bytes(range(256)) * 4
+        expected = Protocol.parse_message(Protocol.image_chunk(
+            "alice", "bob", "img1", 3, base64.b64encode(chunk).decode('utf-8'), "nonce"
+        ))
+        parsed = Protocol.parse_message(Protocol.image_chunk_bytes(
+            Protocol.encode_field("from_id", "alice"), "bob", "img1", 3, chunk, "nonce"
+        ).decode('utf-8'))
+        
+        del expected['timestamp']
+        del parsed['timestamp']
+        self.assertEqual(parsed, expected)
+        self.assertEqual(base64.b64decode(parsed['encrypted_data']), chunk)
+    
     def test_join_channel(self):
         """Test join channel message"""
         msg = Protocol.join_channel("user123", "#test", "password123")